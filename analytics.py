@@ -0,0 +1,143 @@
+"""
+Gameplay analytics for AWS Cloud Heroes game.
+Contains a background event logger writing compressed, rotated JSONL files and a streaming reader.
+"""
+
+import atexit
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from config import *
+
+class AnalyticsLogger:
+    """Queues gameplay events and writes them from a background thread.
+    
+    log() only appends to a bounded deque, which is safe without locks for one
+    producer and one consumer, so the game loop never waits on compression or disk.
+    Events arriving while the queue is full are dropped and counted.
+    """
+    
+    def __init__(self, directory=ANALYTICS_DIR, queue_size=ANALYTICS_QUEUE_SIZE,
+                 flush_interval=ANALYTICS_FLUSH_INTERVAL, rotate_bytes=ANALYTICS_ROTATE_BYTES):
+        if directory and not os.path.isabs(directory):
+            directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), directory)
+        self.directory = directory
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.events = deque()
+        self.dropped = 0
+        self.written = 0
+        self.file = None
+        self.file_bytes = 0
+        self.file_index = 0
+        self.wake = threading.Event()
+        self.stopping = False
+        self.writer = None
+        
+        if not directory:
+            return
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            print(f"Analytics will not be saved: {e}")
+            self.directory = None
+            return
+        
+        self.writer = threading.Thread(target=self._write_loop, name="analytics-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+    
+    def log(self, event_type, **fields):
+        """Queue an event; it is written to disk later by the background thread."""
+        if self.writer is None:
+            return
+        if len(self.events) >= self.queue_size:
+            self.dropped += 1
+            return
+        fields['type'] = event_type
+        fields['time'] = time.time()
+        self.events.append(fields)
+    
+    def close(self):
+        """Write every queued event and stop the writer thread."""
+        if self.writer is not None:
+            self.stopping = True
+            self.wake.set()
+            self.writer.join()
+            self.writer = None
+    
+    def _write_loop(self):
+        """Write queued events in batches until told to stop."""
+        while True:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            stopping = self.stopping
+            
+            lines = []
+            while self.events:
+                lines.append(json.dumps(self.events.popleft(), separators=(',', ':')))
+            
+            if lines:
+                try:
+                    self._write('\n'.join(lines) + '\n')
+                    self.written += len(lines)
+                except OSError as e:
+                    print(f"Error saving analytics: {e}")
+            
+            if stopping:
+                break
+        
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+    
+    def _write(self, text):
+        """Append text to the current log file, starting a new one when it is full."""
+        data = text.encode('utf-8')
+        if self.file is None or self.file_bytes + len(data) > self.rotate_bytes:
+            self._rotate()
+        self.file.write(data)
+        self.file.flush()
+        self.file_bytes += len(data)
+    
+    def _rotate(self):
+        """Close the current log file and open the next one."""
+        if self.file is not None:
+            self.file.close()
+        self.file_index += 1
+        name = time.strftime('events-%Y%m%d-%H%M%S') + f'-{os.getpid()}-{self.file_index}.jsonl.gz'
+        self.file = gzip.open(os.path.join(self.directory, name), 'wb')
+        self.file_bytes = 0
+
+def read_events(path):
+    """Yield events one at a time from a log file or every log file in a directory.
+    
+    Files are decompressed as a stream, so even large logs are never held in
+    memory. A file cut short by a crash yields the events before the damage.
+    """
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, '*.jsonl.gz')) + glob.glob(os.path.join(path, '*.jsonl')))
+    else:
+        paths = [path]
+    
+    for file_path in paths:
+        opener = gzip.open if file_path.endswith('.gz') else open
+        with opener(file_path, 'rt', encoding='utf-8') as f:
+            try:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            # A partly written last line
+                            continue
+            except (EOFError, zlib.error):
+                # Truncated compressed stream
+                continue
@@ -7,107 +7,299 @@ import pygame
 import random
 import math
 from config import *
+from fonts import get_font
+from ui import text_cache
+from particles import ParticleEngine, load_numpy
+
+# Stars have five-fold symmetry, so rotation frames only need to cover one fifth of a turn
+STAR_SYMMETRY_ANGLE = 2 * math.pi / 5
+
+class Cloud:
+    """A cloud drifting across the top of the screen."""
+    
+    __slots__ = ('x', 'y', 'size', 'speed')
+    
+    def __init__(self, x, y, size, speed):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.speed = speed
+
+class Star:
+    """A star rotating in place."""
+    
+    __slots__ = ('x', 'y', 'size', 'angle', 'speed')
+    
+    def __init__(self, x, y, size, angle, speed):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.angle = angle
+        self.speed = speed
+
+class LambdaSymbol:
+    """A lambda symbol moving sideways near the bottom of the screen."""
+    
+    __slots__ = ('x', 'y', 'size', 'direction', 'speed')
+    
+    def __init__(self, x, y, size, direction, speed):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.direction = direction
+        self.speed = speed
+
+class SpriteAtlas:
+    """Pre-rendered sprites keyed by shape, size and rotation frame."""
+    
+    def __init__(self):
+        self.sprites = {}
+    
+    def get(self, key):
+        """Return the (sprite, offset) pair for the key, or None if not baked."""
+        return self.sprites.get(key)
+    
+    def add(self, key, sprite, offset):
+        """Store a sprite with its offset from the element center."""
+        self.sprites[key] = (sprite, offset)
+    
+    def __contains__(self, key):
+        return key in self.sprites
+    
+    def __len__(self):
+        return len(self.sprites)
+    
+    def size_bytes(self):
+        """Return the pixel memory used by all sprites."""
+        return sum(sprite.get_pitch() * sprite.get_height() for sprite, _ in self.sprites.values())
 
 class AnimationManager:
     """Manages animated elements on the screen."""
     
-    def __init__(self, surface):
+    def __init__(self, surface, use_atlas=ANIMATION_SPRITE_ATLAS, use_numpy=None,
+                 cloud_count=CLOUD_COUNT, star_count=STAR_COUNT, lambda_count=LAMBDA_COUNT):
         self.surface = surface
         self.clouds = []
         self.stars = []
         self.lambda_functions = []
+        self.cloud_count = cloud_count
+        self.star_count = star_count
+        self.lambda_count = lambda_count
+        self.use_atlas = use_atlas
+        self.atlas = SpriteAtlas()
+        # None picks the vectorized engine automatically for large element counts
+        self.use_numpy = use_numpy
+        self.engine = None
         self.initialized = False
     
     def initialize(self):
         """Initialize animation elements."""
         # Create clouds (representing AWS cloud)
         self.clouds = []
-        for i in range(5):
-            cloud = {
-                'x': random.randint(0, WINDOW_WIDTH),
-                'y': random.randint(50, 150),
-                'size': random.randint(60, 100),
-                'speed': random.uniform(0.5, 1.5)
-            }
+        for i in range(self.cloud_count):
+            cloud = Cloud(
+                x=random.randint(0, WINDOW_WIDTH),
+                y=random.randint(50, 150),
+                size=random.randint(*CLOUD_SIZE_RANGE),
+                speed=random.uniform(0.5, 1.5)
+            )
             self.clouds.append(cloud)
         
         # Create stars (representing S3)
         self.stars = []
-        for i in range(8):
-            star = {
-                'x': random.randint(0, WINDOW_WIDTH),
-                'y': random.randint(50, WINDOW_HEIGHT - 100),
-                'size': random.randint(15, 30),
-                'angle': 0,
-                'speed': random.uniform(0.02, 0.05)
-            }
+        for i in range(self.star_count):
+            star = Star(
+                x=random.randint(0, WINDOW_WIDTH),
+                y=random.randint(50, WINDOW_HEIGHT - 100),
+                size=random.randint(*STAR_SIZE_RANGE),
+                angle=0,
+                speed=random.uniform(0.02, 0.05)
+            )
             self.stars.append(star)
         
         # Create lambda functions (representing AWS Lambda)
         self.lambda_functions = []
-        for i in range(3):
-            lambda_func = {
-                'x': random.randint(50, WINDOW_WIDTH - 50),
-                'y': random.randint(WINDOW_HEIGHT - 200, WINDOW_HEIGHT - 100),
-                'size': random.randint(30, 50),
-                'direction': random.choice([-1, 1]),
-                'speed': random.uniform(1, 2)
-            }
+        for i in range(self.lambda_count):
+            lambda_func = LambdaSymbol(
+                x=random.randint(50, WINDOW_WIDTH - 50),
+                y=random.randint(WINDOW_HEIGHT - 200, WINDOW_HEIGHT - 100),
+                size=random.randint(*LAMBDA_SIZE_RANGE),
+                direction=random.choice([-1, 1]),
+                speed=random.uniform(1, 2)
+            )
             self.lambda_functions.append(lambda_func)
         
+        # Load every font the elements need now so drawing never builds one
+        for size in {star.size for star in self.stars}:
+            get_font(int(size/2))
+        for size in {lambda_func.size for lambda_func in self.lambda_functions}:
+            get_font(size)
+        
+        self.engine = None
+        if self._wants_engine():
+            self.engine = ParticleEngine(self.clouds, self.stars, self.lambda_functions)
+        
+        if self.use_atlas:
+            self._build_atlas()
+        
         self.initialized = True
     
+    def _wants_engine(self):
+        """Return whether the elements should be updated by the NumPy engine."""
+        if self.use_numpy is None:
+            total = len(self.clouds) + len(self.stars) + len(self.lambda_functions)
+            if total < ANIMATION_NUMPY_THRESHOLD:
+                return False
+        elif not self.use_numpy:
+            return False
+        return load_numpy() is not None
+    
     def update(self):
         """Update positions of animated elements."""
         if not self.initialized:
             self.initialize()
+        
+        if self.engine is not None:
+            self.engine.update()
+            return
             
         # Update cloud positions
         for cloud in self.clouds:
-            cloud['x'] += cloud['speed']
-            if cloud['x'] > WINDOW_WIDTH + cloud['size']:
-                cloud['x'] = -cloud['size']
-                cloud['y'] = random.randint(50, 150)
+            cloud.x += cloud.speed
+            if cloud.x > WINDOW_WIDTH + cloud.size:
+                cloud.x = -cloud.size
+                cloud.y = random.randint(50, 150)
         
         # Update star rotations
         for star in self.stars:
-            star['angle'] += star['speed']
+            star.angle += star.speed
         
         # Update lambda positions
         for lambda_func in self.lambda_functions:
-            lambda_func['x'] += lambda_func['speed'] * lambda_func['direction']
-            if lambda_func['x'] > WINDOW_WIDTH - 50 or lambda_func['x'] < 50:
-                lambda_func['direction'] *= -1
+            lambda_func.x += lambda_func.speed * lambda_func.direction
+            if lambda_func.x > WINDOW_WIDTH - 50 or lambda_func.x < 50:
+                lambda_func.direction *= -1
     
     def draw(self):
-        """Draw all animated elements."""
+        """Draw all animated elements and return the areas they cover."""
         if not self.initialized:
             self.initialize()
+        
+        if self.use_atlas:
+            return self._draw_sprites()
+        
+        rects = []
             
         # Draw clouds
-        for cloud in self.clouds:
-            self._draw_cloud(cloud['x'], cloud['y'], cloud['size'])
+        for x, y, size in self._cloud_rows():
+            rects.append(self._draw_cloud(x, y, size))
         
         # Draw stars
-        for star in self.stars:
-            self._draw_star(star['x'], star['y'], star['size'], star['angle'])
+        for x, y, size, angle in self._star_rows():
+            rects.append(self._draw_star(x, y, size, angle))
         
         # Draw lambda symbols
-        for lambda_func in self.lambda_functions:
-            self._draw_lambda_symbol(lambda_func['x'], lambda_func['y'], lambda_func['size'])
+        for x, y, size in self._lambda_rows():
+            rects.append(self._draw_lambda_symbol(x, y, size))
+        
+        return rects
+    
+    def _cloud_rows(self):
+        """Return (x, y, size) for every cloud."""
+        if self.engine is not None:
+            return self.engine.clouds.rows('x', 'y', 'size')
+        return ((cloud.x, cloud.y, cloud.size) for cloud in self.clouds)
+    
+    def _star_rows(self):
+        """Return (x, y, size, angle) for every star."""
+        if self.engine is not None:
+            return self.engine.stars.rows('x', 'y', 'size', 'angle')
+        return ((star.x, star.y, star.size, star.angle) for star in self.stars)
+    
+    def _lambda_rows(self):
+        """Return (x, y, size) for every lambda symbol."""
+        if self.engine is not None:
+            return self.engine.lambda_functions.rows('x', 'y', 'size')
+        return ((lambda_func.x, lambda_func.y, lambda_func.size) for lambda_func in self.lambda_functions)
+    
+    def _build_atlas(self):
+        """Rasterize every cloud, star frame and lambda size in use into the atlas."""
+        self.bake_sprites(
+            {cloud.size for cloud in self.clouds},
+            {star.size for star in self.stars},
+            {lambda_func.size for lambda_func in self.lambda_functions}
+        )
+    
+    def bake_sprites(self, cloud_sizes, star_sizes, lambda_sizes):
+        """Rasterize the given sizes into the atlas, skipping sprites it already has."""
+        for size in cloud_sizes:
+            key = ('cloud', size)
+            if key not in self.atlas:
+                self.atlas.add(key, *self._render_sprite(self._draw_cloud, int(size * 1.3), size))
+        
+        step = STAR_SYMMETRY_ANGLE / STAR_ROTATION_FRAMES
+        for size in star_sizes:
+            for frame in range(STAR_ROTATION_FRAMES):
+                key = ('star', size, frame)
+                if key not in self.atlas:
+                    self.atlas.add(key, *self._render_sprite(self._draw_star, size + 1, size, frame * step))
+        
+        for size in lambda_sizes:
+            key = ('lambda', size)
+            if key not in self.atlas:
+                self.atlas.add(key, *self._render_sprite(self._draw_lambda_symbol, size, size))
+    
+    def _render_sprite(self, draw, extent, *args):
+        """Render one element into its own sprite and return it with its offset from the center."""
+        sprite = pygame.Surface((extent * 2, extent * 2), pygame.SRCALPHA)
+        
+        # Point the draw helpers at the sprite while rendering
+        target, self.surface = self.surface, sprite
+        try:
+            rect = draw(extent, extent, *args)
+        finally:
+            self.surface = target
+        
+        rect = rect.clip(sprite.get_rect())
+        sprite = sprite.subsurface(rect).copy()
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        
+        return sprite, (rect.x - extent, rect.y - extent)
+    
+    def _draw_sprites(self):
+        """Draw all animated elements from the atlas in one batched blit."""
+        blits = []
+        
+        for x, y, size in self._cloud_rows():
+            sprite, offset = self.atlas.get(('cloud', size))
+            blits.append((sprite, (int(x) + offset[0], int(y) + offset[1])))
+        
+        for x, y, size, angle in self._star_rows():
+            frame = int(round((angle % STAR_SYMMETRY_ANGLE) / STAR_SYMMETRY_ANGLE * STAR_ROTATION_FRAMES))
+            sprite, offset = self.atlas.get(('star', size, frame % STAR_ROTATION_FRAMES))
+            blits.append((sprite, (int(x) + offset[0], int(y) + offset[1])))
+        
+        for x, y, size in self._lambda_rows():
+            sprite, offset = self.atlas.get(('lambda', size))
+            blits.append((sprite, (int(x) + offset[0], int(y) + offset[1])))
+        
+        return self.surface.blits(blits)
     
     def _draw_cloud(self, x, y, size):
         """Draw a simple cloud shape."""
         # Main cloud body
-        pygame.draw.circle(self.surface, WHITE, (int(x), int(y)), int(size))
-        pygame.draw.circle(self.surface, WHITE, (int(x - size/2), int(y)), int(size*0.7))
-        pygame.draw.circle(self.surface, WHITE, (int(x + size/2), int(y)), int(size*0.7))
-        pygame.draw.circle(self.surface, WHITE, (int(x - size/4), int(y - size/3)), int(size*0.6))
-        pygame.draw.circle(self.surface, WHITE, (int(x + size/4), int(y - size/3)), int(size*0.6))
+        rect = pygame.draw.circle(self.surface, WHITE, (int(x), int(y)), int(size))
+        rect.union_ip(pygame.draw.circle(self.surface, WHITE, (int(x - size/2), int(y)), int(size*0.7)))
+        rect.union_ip(pygame.draw.circle(self.surface, WHITE, (int(x + size/2), int(y)), int(size*0.7)))
+        rect.union_ip(pygame.draw.circle(self.surface, WHITE, (int(x - size/4), int(y - size/3)), int(size*0.6)))
+        rect.union_ip(pygame.draw.circle(self.surface, WHITE, (int(x + size/4), int(y - size/3)), int(size*0.6)))
         
         # AWS logo hint (simplified)
-        pygame.draw.line(self.surface, ORANGE, (int(x - size/3), int(y + size/6)), 
-                        (int(x + size/3), int(y + size/6)), 3)
+        rect.union_ip(pygame.draw.line(self.surface, ORANGE, (int(x - size/3), int(y + size/6)), 
+                                       (int(x + size/3), int(y + size/6)), 3))
+        
+        return rect
     
     def _draw_star(self, x, y, size, angle):
         """Draw a star shape (representing S3)."""
@@ -123,31 +315,35 @@ class AnimationManager:
             inner_y = y + size/2.5 * math.sin(angle + i * 2 * math.pi / 5 + math.pi/5)
             points.append((inner_x, inner_y))
         
-        pygame.draw.polygon(self.surface, YELLOW, points)
+        rect = pygame.draw.polygon(self.surface, YELLOW, points)
         
         # S3 text
         try:
-            s3_font = pygame.font.SysFont('Times New Roman', int(size/2))
-            s3_text = s3_font.render("S3", True, BLACK)
+            s3_font = get_font(int(size/2))
+            s3_text = text_cache.render("S3", s3_font, BLACK)
             text_rect = s3_text.get_rect(center=(x, y))
-            self.surface.blit(s3_text, text_rect)
+            rect.union_ip(self.surface.blit(s3_text, text_rect))
         except:
             # Fallback if font fails
             pass
+        
+        return rect
     
     def _draw_lambda_symbol(self, x, y, size):
         """Draw the AWS Lambda symbol (λ)."""
         lambda_color = (254, 153, 0)  # Lambda orange
         try:
-            font = pygame.font.SysFont('Times New Roman', size)
-            lambda_text = font.render("λ", True, lambda_color)
+            font = get_font(size)
+            lambda_text = text_cache.render("λ", font, lambda_color)
             text_rect = lambda_text.get_rect(center=(x, y))
-            self.surface.blit(lambda_text, text_rect)
+            rect = self.surface.blit(lambda_text, text_rect)
             
             # Small box around lambda
             box_rect = pygame.Rect(x - size/2, y - size/2, size, size)
-            pygame.draw.rect(self.surface, lambda_color, box_rect, 2, 3)
+            rect.union_ip(pygame.draw.rect(self.surface, lambda_color, box_rect, 2, 3))
         except:
             # Fallback if font fails
-            pygame.draw.rect(self.surface, lambda_color, 
-                            (x - size/2, y - size/2, size, size), 2, 3)
+            rect = pygame.draw.rect(self.surface, lambda_color, 
+                                    (x - size/2, y - size/2, size, size), 2, 3)
+        
+        return rect
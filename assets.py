@@ -0,0 +1,222 @@
+"""
+Baked assets for AWS Cloud Heroes game.
+Contains the offline baker that packs the static visuals into a single atlas image
+with a compact binary index, and the loader that memory-maps that atlas at startup.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import pygame
+from config import *
+from fonts import font_registry
+from questions import QuestionBank
+from textlayout import fit_option_text
+
+ATLAS_MAGIC = b'ACHA'
+ATLAS_VERSION = 1
+# Byte order of converted 32-bit surfaces on little-endian machines, so blits need no conversion
+ATLAS_PIXEL_FORMAT = 'BGRA'
+ATLAS_PADDING = 1
+
+# Index layout: header, then one entry per image followed by its key as UTF-8 JSON
+HEADER = struct.Struct('<4sH32sIII')  # magic, version, fingerprint, width, height, entry count
+ENTRY = struct.Struct('<HHHHhhH')  # x, y, width, height, offset x, offset y, key length
+
+# Changes to these files can change how the baked images look
+FINGERPRINT_SOURCES = ('config.py', 'game.py', 'ui.py', 'animations.py', 'fonts.py', 'textlayout.py')
+
+def atlas_paths(directory=ASSET_DIR):
+    """Return the pixel and index file paths for the atlas in the given directory."""
+    if not os.path.isabs(directory):
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), directory)
+    return os.path.join(directory, 'atlas.bgra'), os.path.join(directory, 'atlas.idx')
+
+def fingerprint():
+    """Return a digest of everything the baked images depend on."""
+    sha = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in FINGERPRINT_SOURCES:
+        with open(os.path.join(here, name), 'rb') as f:
+            sha.update(f.read())
+    
+    bank_path = QuestionBank.default_path()
+    if bank_path:
+        with open(bank_path, 'rb') as f:
+            sha.update(f.read())
+    
+    sha.update(repr(font_registry.resolve_path(FONT_NAME)).encode())
+    sha.update(pygame.version.ver.encode())
+    return sha.digest()
+
+def collect(game, max_services=ATLAS_MAX_SERVICES):
+    """Render the static images the game shows and return (key, surface, offset) tuples.
+    
+    Text is keyed by ('text', text, font size, color), button faces by
+    ('button', text) and animation sprites by their atlas keys. Only the
+    text of the first max_services services is included, so large banks
+    do not grow the atlas without bound.
+    """
+    images = []
+    bank = QuestionBank.default()
+    services = bank.services[:max_services]
+    
+    # Service names and descriptions as the service box and options draw them
+    for service in services:
+        images.append((('text', service.name, TITLE_FONT_SIZE, WHITE),
+                       game.title_font.render(service.name, True, WHITE), (0, 0)))
+    for description_id in sorted({service.description_id for service in services}):
+        layout = fit_option_text(bank.descriptions[description_id])
+        for line in layout.lines:
+            images.append((('text', line, layout.size, BLACK),
+                           layout.font.render(line, True, BLACK), (0, 0)))
+    
+    # Game over buttons; the start button always pulses so it is drawn live
+    for button in (game.play_again_button, game.menu_button):
+        images.append((('button', button.text), button.render_face(), (0, 0)))
+    
+    # Every size the animation manager can pick
+    manager = game.animation_manager
+    manager.bake_sprites(
+        range(CLOUD_SIZE_RANGE[0], CLOUD_SIZE_RANGE[1] + 1),
+        range(STAR_SIZE_RANGE[0], STAR_SIZE_RANGE[1] + 1),
+        range(LAMBDA_SIZE_RANGE[0], LAMBDA_SIZE_RANGE[1] + 1)
+    )
+    for key, (sprite, offset) in manager.atlas.sprites.items():
+        images.append((key, sprite, offset))
+    
+    return images
+
+def pack(sizes, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+    """Place rectangles on shelves, tallest first, and return their positions and the atlas height."""
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        w, h = sizes[i]
+        if w > width:
+            raise ValueError(f"Image of width {w} does not fit in an atlas {width} pixels wide")
+        
+        # Start a new shelf when the current one is full
+        if x + w > width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+    
+    return positions, y + shelf_height
+
+def bake(game, directory=ASSET_DIR, width=ATLAS_WIDTH, max_height=ATLAS_MAX_HEIGHT, max_services=ATLAS_MAX_SERVICES):
+    """Render the static visuals into an atlas and write it with its index."""
+    images = [image for image in collect(game, max_services) if image[1].get_width() and image[1].get_height()]
+    positions, height = pack([image[1].get_size() for image in images], width)
+    if height > min(max_height, 0xFFFF):
+        raise ValueError(f"Atlas would be {height} pixels tall, more than the limit of {max_height}; "
+                         f"lower ATLAS_MAX_SERVICES or raise ATLAS_WIDTH")
+    
+    # Copy pixels exactly; blending onto the transparent atlas would darken antialiased edges
+    atlas = pygame.Surface((width, max(height, 1)), pygame.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    for (key, surface, offset), position in zip(images, positions):
+        atlas.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+    
+    index = bytearray(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, fingerprint(), width, atlas.get_height(), len(images)))
+    for (key, surface, offset), (x, y) in zip(images, positions):
+        encoded = json.dumps(key, separators=(',', ':')).encode()
+        index += ENTRY.pack(x, y, surface.get_width(), surface.get_height(), offset[0], offset[1], len(encoded))
+        index += encoded
+    
+    # Write the pixels first so a valid index never points at a partial atlas
+    pixel_path, index_path = atlas_paths(directory)
+    os.makedirs(os.path.dirname(pixel_path), exist_ok=True)
+    for path, data in ((pixel_path, pygame.image.tobytes(atlas, ATLAS_PIXEL_FORMAT)), (index_path, bytes(index))):
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+    
+    return {
+        'images': len(images),
+        'width': width,
+        'height': atlas.get_height(),
+        'bytes': os.path.getsize(pixel_path) + os.path.getsize(index_path)
+    }
+
+def _as_key(value):
+    """Turn a decoded JSON key back into the nested tuples the caches use."""
+    if isinstance(value, list):
+        return tuple(_as_key(item) for item in value)
+    return value
+
+class BakedAssets:
+    """Images sliced out of the memory-mapped atlas, keyed like the baker's entries."""
+    
+    def __init__(self, atlas, entries, buffer):
+        self.atlas = atlas
+        self.entries = entries
+        # The atlas surface reads its pixels straight from this mapping
+        self.buffer = buffer
+    
+    def get(self, key):
+        """Return the (surface, offset) pair for the key, or None if it was not baked."""
+        return self.entries.get(key)
+    
+    def texts(self):
+        """Yield (text, font size, color, surface) for every baked text image."""
+        for key, (surface, _) in self.entries.items():
+            if key[0] == 'text':
+                yield key[1], key[2], key[3], surface
+    
+    def sprites(self):
+        """Yield (key, sprite, offset) for every baked animation sprite."""
+        for key, (surface, offset) in self.entries.items():
+            if key[0] in ('cloud', 'star', 'lambda'):
+                yield key, surface, offset
+    
+    def __len__(self):
+        return len(self.entries)
+
+def load(directory=ASSET_DIR):
+    """Memory-map the baked atlas, or return None if it is missing or was baked for other settings."""
+    pixel_path, index_path = atlas_paths(directory)
+    try:
+        with open(index_path, 'rb') as f:
+            index = f.read()
+    except OSError:
+        return None
+    
+    if len(index) < HEADER.size:
+        return None
+    magic, version, digest, width, height, count = HEADER.unpack_from(index)
+    if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+        return None
+    if digest != fingerprint():
+        print("Baked assets are out of date, drawing everything live (run bake_assets.py to rebuild them)")
+        return None
+    
+    try:
+        with open(pixel_path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) != width * height * 4:
+        buffer.close()
+        return None
+    
+    # Pages of the atlas are only read from disk when an image is first drawn
+    atlas = pygame.image.frombuffer(buffer, (width, height), ATLAS_PIXEL_FORMAT)
+    
+    entries = {}
+    position = HEADER.size
+    for _ in range(count):
+        x, y, w, h, offset_x, offset_y, key_length = ENTRY.unpack_from(index, position)
+        position += ENTRY.size
+        key = _as_key(json.loads(index[position:position + key_length]))
+        position += key_length
+        entries[key] = (atlas.subsurface((x, y, w, h)), (offset_x, offset_y))
+    
+    return BakedAssets(atlas, entries, buffer)
@@ -4,14 +4,25 @@ AWS Cloud Heroes - An educational game for children to learn about AWS services.
 This game introduces basic AWS services to children under 10 years old through
 a fun matching game where they connect service names with their functions.
 
-Run this file to start the game.
+Run this file to start the game. Add --startup-report to print how long
+each startup step took.
 """
 
+import sys
+import time
+
+_start = time.perf_counter()
+
 from game import Game
+from profiler import startup_timer
+from config import STARTUP_REPORT
+
+startup_timer.reset(_start)
+startup_timer.mark('import')
 
 if __name__ == "__main__":
     try:
-        game = Game()
+        game = Game(startup_report=STARTUP_REPORT or '--startup-report' in sys.argv)
         game.run()
     except Exception as e:
         print(f"Error running game: {e}")
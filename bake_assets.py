@@ -0,0 +1,47 @@
+"""
+Bake the static visuals of AWS Cloud Heroes into a single atlas image.
+
+Run this after changing config.py, the question bank or the drawing code.
+Until the atlas is rebuilt the game notices it is out of date and draws
+everything live instead.
+
+    python bake_assets.py [--output DIR]
+"""
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import assets
+from analytics import AnalyticsLogger
+from config import ASSET_DIR
+from game import Game
+from highscores import HighScoreStore
+from replay import SessionRecorder
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake the game's static images into an atlas.")
+    parser.add_argument('--output', default=ASSET_DIR, help="directory to write the atlas to")
+    args = parser.parse_args()
+    
+    # Baking only draws, so nothing the game saves is needed
+    game = Game(
+        use_baked_assets=False,
+        high_scores=HighScoreStore(path=None),
+        analytics=AnalyticsLogger(directory=None),
+        recorder=SessionRecorder(directory=None)
+    )
+    try:
+        result = assets.bake(game, args.output)
+    except ValueError as e:
+        print(f"Could not bake assets: {e}")
+        return 1
+    
+    print(f"Baked {result['images']} images into a {result['width']}x{result['height']} atlas "
+          f"({result['bytes'] / 1024:.0f} KiB) in {os.path.abspath(args.output)}")
+
+if __name__ == "__main__":
+    sys.exit(main())
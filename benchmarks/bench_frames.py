@@ -0,0 +1,162 @@
+"""
+Frame-time benchmark for every game state.
+Drives Game headlessly through MENU, PLAYING, FEEDBACK and GAME_OVER with synthetic
+clicks and records per-frame times without the FPS cap.
+
+Run from the repository root:
+    python benchmarks/bench_frames.py [--frames N] [--display WxH] [--output PATH]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import config
+from config import *
+from game import Game
+from highscores import HighScoreStore
+from analytics import AnalyticsLogger
+from replay import SessionRecorder
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def click(game, pos):
+    """Queue a synthetic left click at the given logical position."""
+    if game.scaler is not None:
+        pos = game.scaler.to_display(pos)
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+def option_position(index):
+    """Return the center of the answer option at index."""
+    return (WINDOW_WIDTH / 2, 250 + index * OPTION_VERTICAL_SPACING + OPTION_BOX_HEIGHT / 2)
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of sorted samples."""
+    index = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+    return samples[index]
+
+def measure(game, state, frames, prepare=None):
+    """Time frames while the game stays in state, calling prepare whenever it leaves."""
+    times = []
+    while len(times) < frames:
+        if game.game_state.state != state:
+            prepare()
+            game._run_frame()  # the transition frame is not counted
+            continue
+        start = time.perf_counter()
+        game._run_frame()
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+def measure_transitions(game, count):
+    """Time the frames that leave FEEDBACK and show the next question."""
+    times = []
+    while len(times) < count:
+        if game.game_state.state != PLAYING:
+            game.engine.start_game()
+            game._run_frame()
+        click(game, option_position(game.game_state.correct_option))
+        game._run_frame()  # enters FEEDBACK
+        game._run_frame()  # a feedback frame, during which the next questions are prepared
+        
+        # End the feedback pause so the next frame swaps in the next question
+        game.game_state.feedback_start_time -= FEEDBACK_DURATION
+        start = time.perf_counter()
+        game._run_frame()
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+def summarize(times):
+    """Return percentiles in milliseconds and the uncapped frame rate."""
+    ordered = sorted(times)
+    total = sum(times)
+    return {
+        'frames': len(times),
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p95_ms': percentile(ordered, 0.95) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'fps': len(times) / total if total else 0.0
+    }
+
+def run(frames, display_size=None):
+    """Run the benchmark and return the results for every state."""
+    # Keep benchmark games off the real leaderboard, analytics logs and recordings
+    game = Game(
+        high_scores=HighScoreStore(path=None),
+        analytics=AnalyticsLogger(directory=None),
+        recorder=SessionRecorder(directory=None),
+        display_size=display_size
+    )
+    results = {}
+    
+    results['MENU'] = measure(game, MENU, frames, game.engine.return_to_menu)
+    
+    def start():
+        click(game, (game.start_button.x, game.start_button.y))
+    results['PLAYING'] = measure(game, PLAYING, frames, start)
+    
+    def answer():
+        if game.game_state.state != PLAYING:
+            game.engine.start_game()
+        click(game, option_position(game.game_state.correct_option))
+    results['FEEDBACK'] = measure(game, FEEDBACK, frames, answer)
+    results['FEEDBACK_TO_PLAYING'] = measure_transitions(game, max(1, frames // 10))
+    
+    def finish():
+        if game.game_state.state not in (PLAYING, FEEDBACK):
+            game.engine.start_game()
+        # Move the start of the game back so the timer runs out on the next frame
+        game.game_state.state = PLAYING
+        game.game_state.start_time -= GAME_DURATION * 1000
+    results['GAME_OVER'] = measure(game, GAME_OVER, frames, finish)
+    
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=500, help='frames measured per state')
+    parser.add_argument('--output', help='JSON file to write (default: benchmarks/results/frames-<time>.json)')
+    parser.add_argument('--display', help='display size such as 3840x2160, to measure scaling to a large screen')
+    args = parser.parse_args()
+    
+    display_size = tuple(int(value) for value in args.display.split('x')) if args.display else None
+    results = run(args.frames, display_size)
+    report = {
+        'benchmark': 'frames',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+        'config': {
+            'DIRTY_RECT_RENDERING': config.DIRTY_RECT_RENDERING,
+            'ANIMATION_SPRITE_ATLAS': config.ANIMATION_SPRITE_ATLAS,
+            'DISPLAY_SIZE': display_size
+        },
+        'states': results
+    }
+    
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, time.strftime('frames-%Y%m%d-%H%M%S.json'))
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"{'state':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'fps':>9}")
+    for name, stats in results.items():
+        print(f"{name:<20} {stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f} {stats['fps']:>9.0f}")
+    print(f"Results written to {output}")
+    
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Memory benchmark for game sessions and the question bank.
+Reports the bytes each session and each service keeps alive, measured with
+tracemalloc, sessions both on the game's bank and on a synthetic bank as
+large as --services, since each session's adaptive selector grows with it, next to the same data held as plain dicts and objects with a
+__dict__, the way it was stored before the records were slotted.
+
+Run from the repository root:
+    python benchmarks/bench_memory.py [--sessions N] [--services N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_question_bank import make_services, write_files
+from engine import GameEngine, GameState, ManualClock
+from questions import QuestionBank
+
+def retained(build):
+    """Return what build() returns and the bytes it still holds once it is done."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def slotted_state(state):
+    """Return a copy of a game state."""
+    copy = GameState()
+    for name in GameState.__slots__:
+        setattr(copy, name, getattr(state, name))
+    return copy
+
+def dict_state(state, descriptions):
+    """Return a copy of a game state as an object with a __dict__ and its options as a list of strings."""
+    fields = {name: getattr(state, name) for name in GameState.__slots__}
+    fields['options'] = [descriptions[option] for option in state.options]
+    return SimpleNamespace(**fields)
+
+def measure_sessions(count, bank):
+    """Return bytes per session, its random generator, and per game state held both ways."""
+    clock = ManualClock()
+    
+    def build():
+        engines = []
+        for seed in range(count):
+            engine = GameEngine(clock=clock, rng=random.Random(seed), bank=bank)
+            engine.start_game()
+            engines.append(engine)
+        return engines
+    
+    engines, session_bytes = retained(build)
+    _, rng_bytes = retained(lambda: [random.Random(seed) for seed in range(count)])
+    _, slotted_bytes = retained(lambda: [slotted_state(engine.state) for engine in engines])
+    _, dict_bytes = retained(lambda: [dict_state(engine.state, bank.descriptions) for engine in engines])
+    
+    return {
+        'session': session_bytes / count,
+        'of which random.Random': rng_bytes / count,
+        'game state, slotted': slotted_bytes / count,
+        'game state, dict': dict_bytes / count
+    }
+
+def measure_services(count):
+    """Return bytes per service for a loaded bank, and for the same services as normalized dicts."""
+    with tempfile.TemporaryDirectory() as directory:
+        json_path, _ = write_files(make_services(count), directory)
+        
+        _, bank_bytes = retained(lambda: QuestionBank.load(json_path))
+        
+        def build_dicts():
+            with open(json_path, encoding='utf-8') as f:
+                data = json.load(f)['services']
+            return [QuestionBank._normalize(service) for service in data]
+        _, dict_bytes = retained(build_dicts)
+    
+    return {
+        'service, slotted': bank_bytes / count,
+        'service, dict': dict_bytes / count
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=10000, help='number of game sessions')
+    parser.add_argument('--services', type=int, default=100000, help='number of services in the bank')
+    args = parser.parse_args()
+    
+    banks = [QuestionBank.default(), QuestionBank(make_services(args.services))]
+    for bank in banks:
+        results = measure_sessions(args.sessions, bank)
+        print(f"{args.sessions} sessions, {len(bank)} services in the bank")
+        for name, size in results.items():
+            print(f"  {name:<24} {size:>8.0f} bytes")
+    
+    results = measure_services(args.services)
+    print(f"{args.services} services")
+    for name, size in results.items():
+        print(f"  {name:<24} {size:>8.0f} bytes")
+
+if __name__ == "__main__":
+    main()
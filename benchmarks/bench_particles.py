@@ -0,0 +1,60 @@
+"""
+Benchmark for AnimationManager.update.
+Compares per-element Python updates with the NumPy particle engine from 10 to 100k elements.
+
+Run from the repository root:
+    python benchmarks/bench_particles.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from animations import AnimationManager
+from particles import load_numpy
+
+COUNTS = [10, 100, 1000, 10000, 100000]
+TARGET_SECONDS = 0.5  # time spent measuring each configuration
+
+def time_updates(manager):
+    """Return the mean time of one update() call in microseconds."""
+    manager.update()
+    frames = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TARGET_SECONDS:
+        manager.update()
+        frames += 1
+    return (time.perf_counter() - start) / frames * 1e6
+
+def make_manager(count, use_numpy):
+    """Create an initialized manager with elements split like the default mix."""
+    manager = AnimationManager(
+        None, use_atlas=False, use_numpy=use_numpy,
+        cloud_count=max(1, count * 5 // 16),
+        star_count=max(1, count * 8 // 16),
+        lambda_count=max(1, count * 3 // 16)
+    )
+    manager.initialize()
+    return manager
+
+def main():
+    pygame.font.init()
+    np = load_numpy()
+    if np is None:
+        print("NumPy is not installed; only per-element updates can be measured.")
+    
+    print(f"{'elements':>10} {'python (us)':>12} {'numpy (us)':>12} {'speedup':>9}")
+    for count in COUNTS:
+        python_time = time_updates(make_manager(count, use_numpy=False))
+        if np is None:
+            print(f"{count:>10} {python_time:>12.1f} {'-':>12} {'-':>9}")
+            continue
+        numpy_time = time_updates(make_manager(count, use_numpy=True))
+        print(f"{count:>10} {python_time:>12.1f} {numpy_time:>12.1f} {python_time / numpy_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark for the question bank.
+Times loading 100k services from JSON and CSV and generating questions from the loaded bank.
+
+Run from the repository root:
+    python benchmarks/bench_question_bank.py [--services N]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from engine import GameEngine, ManualClock
+from questions import QuestionBank
+
+CATEGORIES = ["Compute", "Storage", "Database", "Security", "Management"]
+QUESTIONS = 100000
+
+def make_services(count):
+    """Return count synthetic services with distinct descriptions."""
+    rng = random.Random(0)
+    return [
+        {
+            "name": f"Service{i}",
+            "description": f"Does helpful cloud thing number {i}",
+            "color": [rng.randrange(256), rng.randrange(256), rng.randrange(256)],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "difficulty": 1 + i % 3
+        }
+        for i in range(count)
+    ]
+
+def write_files(services, directory):
+    """Write the services as JSON and CSV and return both paths."""
+    json_path = os.path.join(directory, 'services.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({"services": services}, f)
+    
+    csv_path = os.path.join(directory, 'services.csv')
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "description", "color", "category", "difficulty"])
+        for service in services:
+            color = '#{:02x}{:02x}{:02x}'.format(*service["color"])
+            writer.writerow([service["name"], service["description"], color, service["category"], service["difficulty"]])
+    
+    return json_path, csv_path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--services', type=int, default=100000, help='number of services in the bank')
+    args = parser.parse_args()
+    
+    services = make_services(args.services)
+    with tempfile.TemporaryDirectory() as directory:
+        for path in write_files(services, directory):
+            start = time.perf_counter()
+            bank = QuestionBank.load(path)
+            elapsed = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"load {os.path.basename(path):<14} {len(bank):>8} services  {size_mb:6.1f} MB  {elapsed * 1000:8.1f} ms")
+    
+    engine = GameEngine(clock=ManualClock(), rng=random.Random(0), bank=bank)
+    start = time.perf_counter()
+    for _ in range(QUESTIONS):
+        engine.new_question()
+    elapsed = time.perf_counter() - start
+    print(f"new_question with {len(bank)} services: {elapsed / QUESTIONS * 1e6:.2f} us per question")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark for adaptive question selection.
+Times one weight update plus one weighted draw with the Fenwick tree sampler,
+against random.choices with the weight list it needs rebuilt after every update.
+
+Run from the repository root:
+    python benchmarks/bench_sampler.py [--sizes N ...] [--rounds N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sampling import AdaptiveSelector
+
+def time_fenwick(size, rounds):
+    """Return seconds per answer-and-draw round using the Fenwick tree."""
+    rng = random.Random(0)
+    selector = AdaptiveSelector(size)
+    index = selector.select(rng)
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        selector.record(index, rng.random() < 0.7)
+        index = selector.select(rng)
+    return (time.perf_counter() - start) / rounds
+
+def time_choices(size, rounds):
+    """Return seconds per answer-and-draw round using random.choices on rebuilt weights."""
+    rng = random.Random(0)
+    selector = AdaptiveSelector(size)
+    asked = [0] * size
+    missed = [0] * size
+    population = range(size)
+    index = rng.randrange(size)
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        asked[index] += 1
+        if rng.random() >= 0.7:
+            missed[index] += 1
+        weights = [selector.weight(a, m) for a, m in zip(asked, missed)]
+        index = rng.choices(population, weights)[0]
+    return (time.perf_counter() - start) / rounds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000],
+                        help='bank sizes to measure')
+    parser.add_argument('--rounds', type=int, default=2000, help='answers per measurement')
+    args = parser.parse_args()
+    
+    print(f"{'services':>8}  {'fenwick us':>10}  {'choices us':>10}  {'speedup':>8}")
+    for size in args.sizes:
+        fenwick = time_fenwick(size, args.rounds * 10)
+        choices = time_choices(size, max(20, args.rounds * 100 // size))
+        print(f"{size:>8}  {fenwick * 1e6:>10.2f}  {choices * 1e6:>10.1f}  {choices / fenwick:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Load generator for the classroom server.
+Simulates many concurrent players on localhost and reports click-to-feedback latency.
+
+Run from the repository root:
+    python benchmarks/bench_server.py [--players N] [--duration SECONDS] [--port PORT]
+
+Without --port, a server is started in a separate process for the run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from config import *
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of sorted samples."""
+    index = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+    return samples[index]
+
+def free_port():
+    """Return a TCP port that is currently unused on localhost."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+async def read_message(reader):
+    """Read one message from the server."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Server closed the connection")
+    return json.loads(line)
+
+async def play(host, port, deadline, latencies, rng):
+    """Play games until the deadline, recording the latency of every answer.
+    
+    Besides replying to each request the server pushes a message whenever a
+    timer changes the state, so a reader task keeps the latest state and the
+    player acts on that instead of pairing requests with replies.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    latest = {}
+    received = asyncio.Condition()
+    
+    async def receive():
+        try:
+            while True:
+                message = await read_message(reader)
+                async with received:
+                    latest['message'] = message
+                    latest['time'] = time.perf_counter()
+                    received.notify_all()
+        except Exception as error:
+            async with received:
+                latest['error'] = error
+                received.notify_all()
+    
+    async def wait_for(predicate):
+        """Wait until the latest message satisfies predicate and return it."""
+        async with received:
+            await received.wait_for(lambda: 'error' in latest or ('message' in latest and predicate(latest['message'])))
+            if 'error' in latest:
+                raise latest['error']
+            return latest['message']
+    
+    async def send(message):
+        writer.write(json.dumps(message).encode('utf-8') + b'\n')
+        await writer.drain()
+    
+    receiver = asyncio.create_task(receive())
+    try:
+        await send({'op': 'start'})
+        message = await wait_for(lambda message: message['state'] == 'PLAYING')
+        while time.perf_counter() < deadline:
+            message = latest['message']
+            if message['state'] == 'FEEDBACK':
+                # Wait for the server to end the feedback pause
+                await wait_for(lambda message: message['state'] != 'FEEDBACK')
+                continue
+            if message['state'] != 'PLAYING':
+                await send({'op': 'start'})
+                await wait_for(lambda message: message['state'] == 'PLAYING')
+                continue
+            
+            # Think, then click an answer unless the game ended meanwhile
+            await asyncio.sleep(rng.uniform(0.2, 0.8))
+            message = latest['message']
+            if message['state'] != 'PLAYING':
+                continue
+            sent = time.perf_counter()
+            await send({'op': 'answer', 'index': rng.randrange(len(message['options']))})
+            
+            # Only an answer produces FEEDBACK; time running out first shows GAME_OVER instead
+            message = await wait_for(lambda message: message['state'] != 'PLAYING')
+            if message['state'] == 'FEEDBACK':
+                latencies.append(latest['time'] - sent)
+    finally:
+        receiver.cancel()
+        writer.close()
+
+async def wait_for_server(host, port, timeout=10):
+    """Wait until the server accepts connections."""
+    start = time.perf_counter()
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() - start > timeout:
+                raise
+            await asyncio.sleep(0.1)
+
+async def run(args):
+    """Start the server if needed, run every player and report the latencies."""
+    host, port = args.host, args.port
+    server = None
+    if port is None:
+        port = free_port()
+        server = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.join(ROOT, 'server.py'), '--host', host, '--port', str(port),
+            stdout=asyncio.subprocess.DEVNULL
+        )
+    
+    try:
+        await wait_for_server(host, port)
+        latencies = []
+        deadline = time.perf_counter() + args.duration
+        players = [
+            play(host, port, deadline, latencies, random.Random(i))
+            for i in range(args.players)
+        ]
+        start = time.perf_counter()
+        results = await asyncio.gather(*players, return_exceptions=True)
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            await server.wait()
+    
+    errors = [result for result in results if isinstance(result, Exception)]
+    ordered = sorted(latencies)
+    print(f"players: {args.players}  duration: {elapsed:.1f}s  answers: {len(ordered)}  errors: {len(errors)}")
+    if errors:
+        print(f"first error: {errors[0]!r}")
+    if ordered:
+        print(f"answers per second: {len(ordered) / elapsed:.0f}")
+        print("click-to-feedback latency (ms): "
+              f"p50 {percentile(ordered, 0.50) * 1000:.2f}  "
+              f"p95 {percentile(ordered, 0.95) * 1000:.2f}  "
+              f"p99 {percentile(ordered, 0.99) * 1000:.2f}  "
+              f"max {ordered[-1] * 1000:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds to keep playing')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, help='port of a running server (default: start one)')
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
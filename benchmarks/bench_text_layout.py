@@ -0,0 +1,89 @@
+"""
+Benchmark for option text layout.
+Lays out every description in the question bank to fit an option box, first
+with empty width and layout memos, then again with them warm, and compares
+both with measuring every word and line through font.size each time.
+
+Run from the repository root:
+    python benchmarks/bench_text_layout.py [--bank PATH | --services N] [--rounds N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from questions import QuestionBank
+from textlayout import WordWidths, fit_option_text
+
+VOCABULARY = 2000
+
+class UnmemoizedWidths(WordWidths):
+    """Measures every word again, as layout would without the memo."""
+    
+    def widths_for(self, font):
+        return {}
+    
+    def width(self, font, word):
+        self.misses += 1
+        return font.size(word)[0]
+    
+    def layout(self, key):
+        return None
+    
+    def remember_layout(self, key, layout):
+        pass
+
+def make_descriptions(count):
+    """Return count synthetic descriptions of 3 to 40 words from a fixed vocabulary."""
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 12))) for _ in range(VOCABULARY)]
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(3, 40))) for _ in range(count)]
+
+def time_layout(descriptions, widths):
+    """Return seconds to lay out every description once, and the layouts."""
+    start = time.perf_counter()
+    layouts = [fit_option_text(description, widths) for description in descriptions]
+    return time.perf_counter() - start, layouts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bank', help='question bank file to lay out (default: the game\'s bank)')
+    parser.add_argument('--services', type=int, help='lay out this many synthetic descriptions instead')
+    parser.add_argument('--rounds', type=int, default=5, help='warm passes over the bank')
+    args = parser.parse_args()
+    
+    pygame.init()
+    if args.services:
+        descriptions = make_descriptions(args.services)
+    else:
+        bank = QuestionBank.load(args.bank) if args.bank else QuestionBank.default()
+        descriptions = bank.descriptions
+    
+    widths = WordWidths()
+    cold, layouts = time_layout(descriptions, widths)
+    warm = min(time_layout(descriptions, widths)[0] for _ in range(args.rounds))
+    # Re-wrapping with every width remembered, as after a layout is evicted with its font
+    widths.layouts.clear()
+    rewrap = time_layout(descriptions, widths)[0]
+    unmemoized = time_layout(descriptions, UnmemoizedWidths())[0]
+    
+    count = len(descriptions)
+    sizes = sorted(layout.size for layout in layouts)
+    print(f"{count} descriptions, {sum(len(layout.lines) for layout in layouts) / count:.2f} lines on average, "
+          f"font size {sizes[0]}-{sizes[-1]}, {sum(layout.truncated for layout in layouts)} cut short")
+    print(f"  cold memo   {cold * 1000:9.1f} ms  {cold / count * 1e6:8.2f} us per description")
+    print(f"  warm memo   {warm * 1000:9.1f} ms  {warm / count * 1e6:8.2f} us per description")
+    print(f"  warm widths {rewrap * 1000:9.1f} ms  {rewrap / count * 1e6:8.2f} us per description")
+    print(f"  no memo     {unmemoized * 1000:9.1f} ms  {unmemoized / count * 1e6:8.2f} us per description  "
+          f"({unmemoized / warm:.0f}x warm)")
+    print(f"  memo        {widths.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,74 @@ Contains game settings and AWS service definitions.
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 FPS = 60
+UNFOCUSED_FPS = 10  # frame rate for animated screens while the window is in the background
+IDLE_MAX_WAIT = 1000  # milliseconds a static screen may block waiting for input
 GAME_DURATION = 30  # seconds
 FEEDBACK_DURATION = 1500  # milliseconds
+CORRECT_ANSWER_POINTS = 10
+QUESTION_PREFETCH_DEPTH = 2  # questions generated ahead during the feedback pause
+ADAPTIVE_DIFFICULTY = True  # ask more often about the services the player gets wrong
+ADAPTIVE_WEIGHT_SCALE = 1000  # integer weight of a service the player always gets wrong
+
+# Display settings
+DISPLAY_SIZE = None  # real window size; None uses WINDOW_WIDTH x WINDOW_HEIGHT, or the desktop size when fullscreen
+DISPLAY_FULLSCREEN = False
+RENDER_FRAME_BUDGET = 1000 / FPS  # milliseconds a frame may take before the render scale drops
+RENDER_SCALE_HEADROOM = 0.5  # fraction of the budget below which the render scale rises again
+RENDER_SCALE_MIN = 0.25  # lowest render scale, as a fraction of the display resolution
+RENDER_SCALE_STEP = 0.125
+RENDER_SCALE_WINDOW = 30  # frames averaged before the render scale changes
+
+# Rendering settings
+HIT_GRID_CELL_SIZE = 64  # pixel size of the grid cells used to find the widget under the pointer
+DIRTY_RECT_RENDERING = True  # only push changed areas to the display
+DIRTY_RECT_MAX_AREA = 0.5  # fraction of the screen above which a full update is used
+ANIMATION_SPRITE_ATLAS = True  # blit pre-rendered sprites instead of drawing shapes each frame
+STAR_ROTATION_FRAMES = 24  # rotation frames baked per star size
+LAYER_CACHING = True  # keep static screen content in cached layers
+ANIMATION_NUMPY_THRESHOLD = 64  # element count from which NumPy updates are used, if installed
+CLOUD_COUNT = 5
+STAR_COUNT = 8
+LAMBDA_COUNT = 3
+CLOUD_SIZE_RANGE = (60, 100)
+STAR_SIZE_RANGE = (15, 30)
+LAMBDA_SIZE_RANGE = (30, 50)
+
+# High score settings
+HIGH_SCORE_FILE = 'highscores.db'  # SQLite file (relative to the game directory); None disables saving
+HIGH_SCORE_TOP_COUNT = 10
+HIGH_SCORE_BATCH_SIZE = 64  # scores written per commit at most
+HIGH_SCORE_BATCH_WINDOW = 0.5  # seconds the writer waits for more scores before committing
+PLAYER_NAME = "Player"
+
+# Analytics settings
+ANALYTICS_DIR = 'analytics'  # directory for event logs (relative to the game directory); None disables logging
+ANALYTICS_QUEUE_SIZE = 10000  # events held in memory before new ones are dropped
+ANALYTICS_FLUSH_INTERVAL = 1.0  # seconds between background writes
+ANALYTICS_ROTATE_BYTES = 8 * 1024 * 1024  # uncompressed bytes per log file before starting a new one
+
+# Classroom server settings
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_MAX_MESSAGE_BYTES = 4096  # longest message line a client may send
+
+# Recording settings
+RECORDING_DIR = 'recordings'  # directory for session recordings (relative to the game directory); None disables recording
+
+# Baked asset settings
+ASSET_DIR = 'assets'  # directory for the atlas written by bake_assets.py (relative to the game directory)
+ATLAS_WIDTH = 2048  # pixel width of the baked atlas image
+ATLAS_MAX_HEIGHT = 8192  # baking fails rather than write a taller atlas (the index stores 16-bit positions)
+ATLAS_MAX_SERVICES = 200  # services whose name and description text is baked; the rest is drawn live
+
+# Startup settings
+STARTUP_REPORT = False  # print how long each startup step took (also enabled by --startup-report)
+
+# Profiler settings
+PROFILER_HISTORY = 240  # frames kept per phase histogram
+PROFILER_TRACE_FILE = None  # .csv or .jsonl path to export per-frame timings to
+PROFILER_FONT_SIZE = 16
+PROFILER_TOGGLE_KEY = 'f3'  # pygame key name that shows or hides the profiler overlay
 
 # Colors
 WHITE = (255, 255, 255)
@@ -26,6 +92,10 @@ MENU = 0
 PLAYING = 1
 GAME_OVER = 2
 FEEDBACK = 3
+STATE_NAMES = {MENU: "MENU", PLAYING: "PLAYING", GAME_OVER: "GAME_OVER", FEEDBACK: "FEEDBACK"}
+
+# Question bank file (.json or .csv, relative to the game directory); AWS_SERVICES is used if it is missing
+QUESTION_BANK_FILE = 'data/aws_services.json'
 
 # AWS Services for kids (simplified)
 AWS_SERVICES = [
@@ -42,6 +112,11 @@ TITLE_FONT_SIZE = 48
 GAME_FONT_SIZE = 24
 BUTTON_FONT_SIZE = 20
 FEEDBACK_FONT_SIZE = 32
+FONT_NAME = 'Times New Roman'
+FONT_CACHE_SIZE = 64  # maximum number of (face, size) fonts kept loaded
+FONT_PATH_CACHE_FILE = '~/.cache/aws-cloud-heroes/fonts.json'  # resolved font files; None disables the cache
+TEXT_CACHE_MAX_BYTES = 4 * 1024 * 1024  # memory cap for cached text surfaces
+TEXT_MIN_FONT_SIZE = 12  # smallest size text is shrunk to before it is cut short
 
 # UI settings
 BUTTON_PADDING = 10
@@ -49,4 +124,5 @@ SERVICE_BOX_WIDTH = 300
 SERVICE_BOX_HEIGHT = 100
 OPTION_BOX_WIDTH = 600
 OPTION_BOX_HEIGHT = 60
+OPTION_TEXT_PADDING = 8  # space kept clear between option text and the box edge
 OPTION_VERTICAL_SPACING = 80
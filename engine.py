@@ -0,0 +1,262 @@
+"""
+Game rules for AWS Cloud Heroes.
+Contains the display-independent engine that drives game state, questions and timers.
+"""
+
+import random
+import time
+from collections import deque
+from config import *
+from questions import QuestionBank
+from sampling import AdaptiveSelector
+
+class GameState:
+    """Class to manage game state and variables.
+    
+    Options are description ids in the question bank, so a question holds
+    four small integers instead of four strings.
+    """
+    
+    __slots__ = (
+        'state', 'score', 'current_service', 'options', 'correct_option', 'start_time',
+        'feedback_message', 'feedback_color', 'feedback_start_time', 'selected_option',
+        'pause_time', 'total_pause_time', 'question_start_time', 'current_service_id'
+    )
+    
+    def __init__(self):
+        self.state = MENU
+        self.score = 0
+        self.current_service = None
+        self.options = ()
+        self.correct_option = None
+        self.start_time = 0
+        self.feedback_message = ""
+        self.feedback_color = BLACK
+        self.feedback_start_time = 0
+        self.selected_option = -1
+        self.pause_time = 0
+        self.total_pause_time = 0
+        self.question_start_time = 0
+        self.current_service_id = None
+
+class Question:
+    """A generated question: the service asked about and its answer options as description ids."""
+    
+    __slots__ = ('service_id', 'service', 'options', 'correct_option')
+    
+    def __init__(self, service_id, service, options, correct_option):
+        self.service_id = service_id
+        self.service = service
+        self.options = options
+        self.correct_option = correct_option
+
+def monotonic_ms():
+    """Return a monotonic timestamp in milliseconds."""
+    return int(time.monotonic() * 1000)
+
+class ManualClock:
+    """A clock that only moves when advanced, for headless and deterministic runs."""
+    
+    def __init__(self, start=0):
+        self.now = start
+    
+    def __call__(self):
+        return self.now
+    
+    def advance(self, ms):
+        """Move the clock forward by the given number of milliseconds."""
+        self.now += ms
+        return self.now
+
+class GameEngine:
+    """Runs the game rules without any display.
+    
+    Time comes from an injectable clock returning milliseconds, and all
+    randomness from an injectable random.Random, so runs can be reproduced.
+    """
+    
+    __slots__ = (
+        'clock', 'rng', 'game_duration', 'feedback_duration', 'correct_answer_points',
+        '_bank', 'adaptive', '_selector', 'state', 'upcoming', 'transition_listeners'
+    )
+    
+    def __init__(self, clock=None, rng=None, bank=None, adaptive=ADAPTIVE_DIFFICULTY,
+                 game_duration=GAME_DURATION, feedback_duration=FEEDBACK_DURATION,
+                 correct_answer_points=CORRECT_ANSWER_POINTS):
+        self.clock = clock if clock is not None else monotonic_ms
+        self.rng = rng if rng is not None else random.Random()
+        # Rules, overridable so simulations can try other settings
+        self.game_duration = game_duration
+        self.feedback_duration = feedback_duration
+        self.correct_answer_points = correct_answer_points
+        # The default bank is loaded on first use to keep startup fast
+        self._bank = bank
+        self.adaptive = adaptive
+        self._selector = None
+        self.state = GameState()
+        
+        # Questions generated ahead of time, in the order they will be asked
+        self.upcoming = deque()
+        
+        # Callbacks invoked with (old_state, new_state) on every state change
+        self.transition_listeners = []
+    
+    @property
+    def bank(self):
+        """The question bank, loaded from the configured file on first use."""
+        if self._bank is None:
+            self._bank = QuestionBank.default()
+        return self._bank
+    
+    @property
+    def selector(self):
+        """Per-service accuracy weights for adaptive questions, built on first use."""
+        if self._selector is None:
+            self._selector = AdaptiveSelector(len(self.bank))
+        return self._selector
+    
+    def start_game(self):
+        """Initialize a new game."""
+        self.state.score = 0
+        self.state.start_time = self.clock()
+        self.state.total_pause_time = 0
+        self.new_question()
+        self.set_state(PLAYING)
+    
+    def set_state(self, new_state):
+        """Change the game state and notify the transition listeners."""
+        old_state = self.state.state
+        self.state.state = new_state
+        for listener in self.transition_listeners:
+            listener(old_state, new_state)
+    
+    def return_to_menu(self):
+        """Go back to the main menu."""
+        self.set_state(MENU)
+    
+    def reaction_time(self):
+        """Return the milliseconds since the current question appeared."""
+        return self.clock() - self.state.question_start_time
+    
+    def answer(self, index):
+        """Answer the current question with the option at index and return whether it was correct."""
+        self.state.selected_option = index
+        is_correct = (index == self.state.correct_option)
+        
+        if is_correct:
+            self.state.score += self.correct_answer_points
+        
+        # Ask more often about the services the player gets wrong
+        if self.adaptive:
+            self.selector.record(self.state.current_service_id, is_correct)
+        
+        self.show_feedback(is_correct)
+        return is_correct
+    
+    def update(self):
+        """Apply the timers: end the game when time runs out and leave feedback when it expires."""
+        if self.state.state == PLAYING:
+            if self.elapsed_seconds() >= self.game_duration:
+                self.set_state(GAME_OVER)
+        
+        elif self.state.state == FEEDBACK:
+            current_time = self.clock()
+            if current_time - self.state.feedback_start_time >= self.feedback_duration:
+                # Add the pause duration to total_pause_time before moving on
+                self.state.total_pause_time += (current_time - self.state.pause_time)
+                self.new_question()
+                self.set_state(PLAYING)
+    
+    def time_until_next_change(self):
+        """Return the milliseconds until a timer changes what is shown, or None if no timer is running."""
+        if self.state.state == PLAYING:
+            # The countdown changes on every whole second of play
+            elapsed = self.clock() - self.state.start_time - self.state.total_pause_time
+            return 1000 - elapsed % 1000
+        
+        if self.state.state == FEEDBACK:
+            return max(0, self.state.feedback_start_time + self.feedback_duration - self.clock())
+        
+        return None
+    
+    def next_transition_time(self):
+        """Return the clock time at which update() will change the state, or None if no timer is running."""
+        if self.state.state == PLAYING:
+            return self.state.start_time + self.state.total_pause_time + self.game_duration * 1000
+        
+        if self.state.state == FEEDBACK:
+            return self.state.feedback_start_time + self.feedback_duration
+        
+        return None
+    
+    def elapsed_seconds(self):
+        """Return the whole seconds played, not counting feedback pauses."""
+        return (self.clock() - self.state.start_time - self.state.total_pause_time) // 1000
+    
+    def time_remaining(self):
+        """Return the whole seconds left in the game."""
+        return max(0, self.game_duration - self.elapsed_seconds())
+    
+    def select_random_service(self):
+        """Select the index of a random AWS service to quiz the player on."""
+        if self.adaptive:
+            return self.selector.select(self.rng)
+        return self.bank.random_index(self.rng)
+    
+    def generate_answer_options(self, correct_id):
+        """Generate the description ids of the answer options (one correct, three wrong)."""
+        # Select 3 random wrong descriptions
+        selected_wrong = self.bank.sample_distractors(self.rng, correct_id, 3)
+        
+        # Combine with correct and shuffle
+        option_ids = [correct_id] + selected_wrong
+        self.rng.shuffle(option_ids)
+        
+        return tuple(option_ids)
+    
+    def generate_question(self):
+        """Generate a question without making it current."""
+        # Select a random service
+        index = self.select_random_service()
+        service = self.bank.services[index]
+        
+        # Generate answer options
+        options = self.generate_answer_options(service.description_id)
+        
+        # Track the correct option
+        return Question(index, service, options, options.index(service.description_id))
+    
+    def option_descriptions(self, options=None):
+        """Return the text of the given answer options, or of the current question's."""
+        descriptions = self.bank.descriptions
+        return [descriptions[option] for option in (self.state.options if options is None else options)]
+    
+    def prefetch(self, depth=QUESTION_PREFETCH_DEPTH):
+        """Generate questions ahead until depth are queued and return the queue."""
+        while len(self.upcoming) < depth:
+            self.upcoming.append(self.generate_question())
+        return self.upcoming
+    
+    def new_question(self):
+        """Set up a new question for the player, using a prefetched one if available."""
+        self.state.selected_option = -1
+        
+        question = self.upcoming.popleft() if self.upcoming else self.generate_question()
+        self.state.current_service_id = question.service_id
+        self.state.current_service = question.service
+        self.state.options = question.options
+        self.state.correct_option = question.correct_option
+        self.state.question_start_time = self.clock()
+    
+    def show_feedback(self, is_correct):
+        """Show feedback after an answer is selected."""
+        if is_correct:
+            self.state.feedback_message = "CORRECT!"
+            self.state.feedback_color = GREEN
+        else:
+            self.state.feedback_message = "WRONG!"
+            self.state.feedback_color = RED
+        
+        self.set_state(FEEDBACK)
+        self.state.feedback_start_time = self.clock()
+        self.state.pause_time = self.state.feedback_start_time  # Record when feedback started
@@ -0,0 +1,126 @@
+"""
+Font management for AWS Cloud Heroes game.
+Contains a shared registry so each font is only loaded once per process,
+and a file cache of resolved font paths so later launches skip the system font scan.
+"""
+
+import json
+import os
+import pygame
+from collections import OrderedDict
+from config import *
+
+class FontRegistry:
+    """Least-recently-used cache of loaded fonts keyed by face and size."""
+    
+    def __init__(self, max_size=FONT_CACHE_SIZE, path_cache_file=FONT_PATH_CACHE_FILE):
+        self.max_size = max_size
+        self.path_cache_file = os.path.expanduser(path_cache_file) if path_cache_file else None
+        self.font_paths = None
+        self.fonts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.eviction_listeners = []
+    
+    def get(self, face, size):
+        """Return the font for the given face and size, loading it if needed."""
+        key = (face, int(size))
+        font = self.fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            self.fonts.move_to_end(key)
+            return font
+        
+        self.misses += 1
+        font = self._load(face, key[1])
+        self.fonts[key] = font
+        
+        # Evict the least recently used fonts once over capacity
+        while len(self.fonts) > self.max_size:
+            _, evicted = self.fonts.popitem(last=False)
+            self.evictions += 1
+            for listener in self.eviction_listeners:
+                listener(evicted)
+        
+        return font
+    
+    def _load(self, face, size):
+        """Load a font from the system, falling back to the default font."""
+        if not pygame.font.get_init():
+            pygame.font.init()
+        try:
+            path = self.resolve_path(face) if face is not None else None
+            return pygame.font.Font(path, size)
+        except Exception:
+            # Fallback to default font if custom font not available
+            return pygame.font.Font(None, size)
+    
+    def resolve_path(self, face):
+        """Return the file for a font face, or None for the default font.
+        
+        Looking a face up makes pygame scan every system font, which is slow, so
+        resolved paths are kept in a cache file and reused by later launches.
+        """
+        if self.font_paths is None:
+            self.font_paths = self._read_path_cache()
+        
+        if face in self.font_paths:
+            path = self.font_paths[face]
+            if path is None or os.path.exists(path):
+                return path
+        
+        path = pygame.font.match_font(face)
+        self.font_paths[face] = path
+        self._write_path_cache()
+        return path
+    
+    def _read_path_cache(self):
+        """Read resolved font paths from the cache file."""
+        if not self.path_cache_file:
+            return {}
+        try:
+            with open(self.path_cache_file, encoding='utf-8') as f:
+                paths = json.load(f)
+            return paths if isinstance(paths, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_path_cache(self):
+        """Save resolved font paths to the cache file, ignoring failures."""
+        if not self.path_cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path_cache_file), exist_ok=True)
+            with open(self.path_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.font_paths, f)
+        except OSError:
+            pass
+    
+    def add_eviction_listener(self, listener):
+        """Register a callback invoked with each font removed from the registry."""
+        self.eviction_listeners.append(listener)
+    
+    def clear(self):
+        """Drop every loaded font."""
+        evicted = list(self.fonts.values())
+        self.fonts.clear()
+        for font in evicted:
+            for listener in self.eviction_listeners:
+                listener(font)
+    
+    def stats(self):
+        """Return hit, miss and eviction counters."""
+        return {
+            'fonts': len(self.fonts),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+# Shared registry used by the whole game
+font_registry = FontRegistry()
+
+def get_font(size, face=FONT_NAME):
+    """Return a shared font of the given size from the process-wide registry."""
+    return font_registry.get(face, size)
@@ -1,82 +1,202 @@
 """
 Game logic for AWS Cloud Heroes.
-Contains the main game mechanics and state management.
+Contains the pygame view that draws the game and feeds input to the engine.
 """
 
 import pygame
 import random
 import sys
+import time
 from pygame.locals import *
 from config import *
-from ui import Button, TextRenderer
+from ui import Button, TextRenderer, text_cache
 from animations import AnimationManager
+from fonts import get_font
+from renderer import DirtyRectRenderer, ScaledDisplay
+from engine import GameEngine
+from profiler import PhaseProfiler, startup_timer
+from scheduler import FrameScheduler
+from layers import Compositor, Layer
+from widgets import WidgetLayer
+from textlayout import fit_option_text
+from highscores import HighScoreStore
+from analytics import AnalyticsLogger
+from replay import SessionRecorder
+import assets
 
-class GameState:
-    """Class to manage game state and variables."""
-    
-    def __init__(self):
-        self.state = MENU
-        self.score = 0
-        self.current_service = None
-        self.options = []
-        self.correct_option = None
-        self.start_time = 0
-        self.feedback_message = ""
-        self.feedback_color = BLACK
-        self.feedback_start_time = 0
-        self.selected_option = -1
-        self.pause_time = 0
-        self.total_pause_time = 0
+# Window events that exist depend on the pygame version
+FOCUS_LOST_EVENTS = tuple(getattr(pygame, name) for name in ('WINDOWFOCUSLOST',) if hasattr(pygame, name))
+FOCUS_GAINED_EVENTS = tuple(getattr(pygame, name) for name in ('WINDOWFOCUSGAINED',) if hasattr(pygame, name))
+EXPOSE_EVENTS = tuple(getattr(pygame, name) for name in ('VIDEOEXPOSE', 'WINDOWEXPOSED') if hasattr(pygame, name))
 
 class Game:
     """Main game class that manages the game loop and states."""
     
-    def __init__(self):
-        """Initialize the game."""
+    def __init__(self, startup_report=STARTUP_REPORT, use_baked_assets=True, clock=None, seed=None,
+                 high_scores=None, analytics=None, recorder=None,
+                 display_size=DISPLAY_SIZE, fullscreen=DISPLAY_FULLSCREEN):
+        """Initialize the game.
+        
+        The clock returns milliseconds and defaults to pygame's; replays pass a
+        ManualClock. The leaderboard, analytics and recorder can be replaced,
+        for example by ones that save nothing.
+        """
         # Initialize pygame
         pygame.init()
+        startup_timer.mark('pygame.init')
+        self.startup_report = startup_report
         
         try:
-            # Set up the window
-            self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            # Set up the window; fullscreen without a size uses the desktop resolution
+            if display_size is None:
+                display_size = (0, 0) if fullscreen else (WINDOW_WIDTH, WINDOW_HEIGHT)
+            self.display = pygame.display.set_mode(display_size, pygame.FULLSCREEN if fullscreen else 0)
             pygame.display.set_caption('AWS Cloud Heroes')
             
+            # Everything draws at the logical resolution; a display of another size gets a scaled copy
+            if self.display.get_size() != (WINDOW_WIDTH, WINDOW_HEIGHT):
+                self.scaler = ScaledDisplay(self.display)
+                self.window = self.scaler.canvas
+            else:
+                self.scaler = None
+                self.window = self.display
+            startup_timer.mark('display')
+            
             # Initialize fonts
             self._init_fonts()
+            startup_timer.mark('fonts')
             
-            # Create overlay surface for effects
-            self.overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+            # Resources only needed after the menu are created on first use
+            self._overlay = None
+            self._feedback_font = None
+            self._play_again_button = None
+            self._menu_button = None
             
-            # Initialize game state
-            self.game_state = GameState()
-            
-            # Pre-compute all descriptions for efficiency
-            self.all_descriptions = [service["description"] for service in AWS_SERVICES]
+            # The clock is read once per frame so every rule in a frame sees the same time
+            self.clock = clock if clock is not None else pygame.time.get_ticks
+            self.frame_time = self.clock()
             
             # Initialize animation manager
             self.animation_manager = AnimationManager(self.window)
             
+            # Static images come from the baked atlas when it matches the current settings
+            self.baked_assets = assets.load() if use_baked_assets else None
+            self._apply_baked_assets()
+            startup_timer.mark('assets')
+            
+            # Only push the areas that change each frame to the display
+            self.renderer = DirtyRectRenderer(self.window, scaler=self.scaler)
+            
+            # Time each phase of the main loop
+            self.profiler = PhaseProfiler()
+            
+            # Idle on static screens instead of redrawing at full speed
+            self.scheduler = FrameScheduler()
+            FrameScheduler.restrict_events()
+            
+            # Leaderboard saved in the background
+            self.high_scores = high_scores if high_scores is not None else HighScoreStore()
+            
+            # Gameplay events written in the background
+            self.analytics = analytics if analytics is not None else AnalyticsLogger()
+            
+            # The seed and clicks of each session, so it can be replayed
+            self.recorder = recorder if recorder is not None else SessionRecorder()
+            self.clicks = []
+            
+            # Replays that only check the rules can skip drawing
+            self.drawing = True
+            
+            # The engine owns the rules; the game only draws its state
+            self.start_session(seed)
+            
             # Initialize UI elements
             self._init_ui()
             
+            # Cache static screen content in layers
+            self._init_layers()
+            
+            # Lay out the clickable areas once and share them between drawing and input
+            self._init_widgets()
+            startup_timer.mark('ui')
+            
+            self.running = False
+            
         except Exception as e:
             print(f"Error initializing game: {e}")
             pygame.quit()
             sys.exit(1)
     
+    def start_session(self, seed=None):
+        """Create a fresh engine whose randomness comes from seed, or from a new random seed."""
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.engine = GameEngine(clock=self._frame_clock, rng=random.Random(self.seed))
+        self.engine.transition_listeners.append(self._log_transition)
+        self.game_state = self.engine.state
+        self.recorder.begin(self.seed)
+    
+    def _frame_clock(self):
+        """Return the time the current frame started."""
+        return self.frame_time
+    
     def _init_fonts(self):
-        """Initialize game fonts with fallbacks."""
-        try:
-            self.title_font = pygame.font.SysFont('Times New Roman', TITLE_FONT_SIZE)
-            self.game_font = pygame.font.SysFont('Times New Roman', GAME_FONT_SIZE)
-            self.button_font = pygame.font.SysFont('Times New Roman', BUTTON_FONT_SIZE)
-            self.feedback_font = pygame.font.SysFont('Times New Roman', FEEDBACK_FONT_SIZE)
-        except:
-            # Fallback to default font if custom font not available
-            self.title_font = pygame.font.Font(None, TITLE_FONT_SIZE)
-            self.game_font = pygame.font.Font(None, GAME_FONT_SIZE)
-            self.button_font = pygame.font.Font(None, BUTTON_FONT_SIZE)
-            self.feedback_font = pygame.font.Font(None, FEEDBACK_FONT_SIZE)
+        """Initialize the fonts the menu needs from the shared font registry."""
+        self.title_font = get_font(TITLE_FONT_SIZE)
+        self.game_font = get_font(GAME_FONT_SIZE)
+        self.button_font = get_font(BUTTON_FONT_SIZE)
+    
+    def _apply_baked_assets(self):
+        """Seed the text cache and animation atlas with images from the baked atlas."""
+        if self.baked_assets is None:
+            return
+        
+        for text, size, color, surface in self.baked_assets.texts():
+            text_cache.preload(text, get_font(size), color, surface)
+        for key, sprite, offset in self.baked_assets.sprites():
+            self.animation_manager.atlas.add(key, sprite, offset)
+    
+    def _apply_baked_face(self, button):
+        """Give a button its baked face, if the atlas has one."""
+        if self.baked_assets is not None:
+            entry = self.baked_assets.get(('button', button.text))
+            if entry is not None:
+                button.face = entry[0]
+    
+    @property
+    def feedback_font(self):
+        """Font for the feedback box, loaded on first use."""
+        if self._feedback_font is None:
+            self._feedback_font = get_font(FEEDBACK_FONT_SIZE)
+        return self._feedback_font
+    
+    @property
+    def overlay(self):
+        """Surface used to dim the screen behind the feedback box, created on first use."""
+        if self._overlay is None:
+            self._overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        return self._overlay
+    
+    @property
+    def play_again_button(self):
+        """Game over button that starts a new game, created on first use."""
+        if self._play_again_button is None:
+            self._play_again_button = Button(
+                WINDOW_WIDTH / 2, 325, 200, 50, ORANGE, "Play Again", WHITE,
+                self.button_font, (255, 140, 0), 3
+            )
+            self._apply_baked_face(self._play_again_button)
+        return self._play_again_button
+    
+    @property
+    def menu_button(self):
+        """Game over button that returns to the menu, created on first use."""
+        if self._menu_button is None:
+            self._menu_button = Button(
+                WINDOW_WIDTH / 2, 395, 200, 50, ORANGE, "Main Menu", WHITE,
+                self.button_font, (255, 140, 0), 3
+            )
+            self._apply_baked_face(self._menu_button)
+        return self._menu_button
     
     def _init_ui(self):
         """Initialize UI elements."""
@@ -88,107 +208,283 @@ class Game:
             self.button_font, (255, 140, 0), 3
         )
         self.start_button.pulsing = True
-        
-        self.play_again_button = Button(
-            center_x, 325, 200, 50, ORANGE, "Play Again", WHITE,
-            self.button_font, (255, 140, 0), 3
-        )
-        
-        self.menu_button = Button(
-            center_x, 395, 200, 50, ORANGE, "Main Menu", WHITE,
-            self.button_font, (255, 140, 0), 3
-        )
     
     def run(self):
         """Run the main game loop."""
-        clock = pygame.time.Clock()
-        running = True
+        self.running = True
         
-        while running:
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    running = False
-                
-                if event.type == MOUSEBUTTONDOWN:
-                    self._handle_mouse_click(event.pos)
-            
-            # Update animations if in menu state
-            if self.game_state.state == MENU:
+        self._run_frame()
+        startup_timer.mark('first frame')
+        if self.startup_report:
+            print(startup_timer.report())
+        
+        while self.running:
+            self.scheduler.wait(self._idle_timeout())
+            self._run_frame()
+        
+        self.profiler.stop_trace()
+        self.high_scores.close()
+        self.analytics.close()
+        self.recorder.close()
+        pygame.quit()
+        sys.exit()
+    
+    def _run_frame(self):
+        """Run one frame: handle input, apply timers, draw and update the display."""
+        profiler = self.profiler
+        frame_start = time.perf_counter()
+        self.frame_time = self.clock()
+        previous_state = self.game_state.state
+        self.clicks.clear()
+        
+        with profiler.phase('events'):
+            self._handle_events()
+        
+        # Apply game timers
+        with profiler.phase('engine'):
+            self.engine.update()
+        
+        # Save the result as soon as a game ends, so the game over screen already shows it
+        if previous_state != GAME_OVER and self.game_state.state == GAME_OVER:
+            self.high_scores.record(PLAYER_NAME, self.game_state.score)
+        
+        # Update animations if in menu state
+        if self.game_state.state == MENU:
+            with profiler.phase('animation'):
                 self.animation_manager.update()
-            
+        
+        if self.drawing:
             # Draw the current game state
-            self._draw_current_state()
+            with profiler.phase('draw'):
+                self.renderer.begin_frame(self._scene_key())
+                self._draw_current_state()
+            
+            if profiler.overlay_visible:
+                self.renderer.mark(profiler.draw_overlay(self.window))
             
-            # Update the display
-            pygame.display.update()
-            clock.tick(FPS)
+            # Update the changed parts of the display
+            with profiler.phase('display'):
+                self.renderer.present()
+            
+            # Lower the render resolution when scaling to a large display cannot keep up
+            if self.scaler is not None:
+                self.scaler.record_frame((time.perf_counter() - frame_start) * 1000)
         
-        pygame.quit()
-        sys.exit()
+        # Prepare the next questions while the player reads the feedback
+        if self.game_state.state == FEEDBACK:
+            with profiler.phase('prefetch'):
+                self._prefetch_questions()
+        
+        # Track how long the frame that swaps in the next question takes
+        if previous_state == FEEDBACK and self.game_state.state == PLAYING:
+            profiler.record('transition', (time.perf_counter() - frame_start) * 1000)
+        
+        self.recorder.frame(self.frame_time, self.clicks, self.game_state.state, self.game_state.score)
+        
+        profiler.end_frame()
+    
+    def _handle_events(self):
+        """Process pending pygame events."""
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                self.running = False
+            
+            if event.type == MOUSEBUTTONDOWN:
+                # Buttons and options are laid out at the logical resolution
+                pos = self.scaler.to_logical(event.pos) if self.scaler else event.pos
+                self.clicks.append((pos[0], pos[1], event.button))
+                with self.profiler.phase('click'):
+                    self._handle_mouse_click(pos)
+            
+            if event.type == KEYDOWN and pygame.key.name(event.key) == PROFILER_TOGGLE_KEY:
+                self.profiler.toggle_overlay()
+                self.renderer.invalidate()
+            
+            if event.type in FOCUS_LOST_EVENTS:
+                self.scheduler.set_focused(False)
+            elif event.type in FOCUS_GAINED_EVENTS:
+                self.scheduler.set_focused(True)
+            
+            if event.type in EXPOSE_EVENTS:
+                # The window contents were lost, so redraw everything
+                self.renderer.invalidate()
+    
+    def _idle_timeout(self):
+        """Return how long the loop may block waiting for input, or None to keep animating."""
+        # The menu animates and the profiler overlay updates every frame
+        if self.game_state.state == MENU or self.profiler.overlay_visible:
+            return None
+        
+        # Drawing the last frame took time, so look at the clock again
+        self.frame_time = self.clock()
+        timeout = self.engine.time_until_next_change()
+        if timeout is None:
+            return IDLE_MAX_WAIT
+        return min(timeout, IDLE_MAX_WAIT)
+    
+    def _prefetch_questions(self):
+        """Generate upcoming questions and render their text ahead of time."""
+        for question in self.engine.prefetch():
+            # Rendering fills the text cache, so drawing the question later is just a blit
+            text_cache.render(question.service.name, self.title_font, WHITE)
+            for option in self.engine.option_descriptions(question.options):
+                layout = fit_option_text(option)
+                for line in layout.lines:
+                    text_cache.render(line, layout.font, BLACK)
     
     def _handle_mouse_click(self, pos):
         """Handle mouse clicks based on current game state."""
+        widgets = self.widgets.get(self.game_state.state)
+        if widgets is None:
+            return
+        target = widgets.hit(pos)
+        
         if self.game_state.state == MENU:
-            if self.start_button.is_clicked(pos):
+            if target == 'start':
                 self._start_game()
         
         elif self.game_state.state == PLAYING:
-            self._handle_playing_click(pos)
+            self._handle_playing_click(target)
         
         elif self.game_state.state == GAME_OVER:
-            if self.play_again_button.is_clicked(pos):
+            if target == 'play_again':
                 self._start_game()
-            elif self.menu_button.is_clicked(pos):
-                self.game_state.state = MENU
+            elif target == 'menu':
+                self.engine.return_to_menu()
     
-    def _handle_playing_click(self, pos):
-        """Handle mouse clicks during gameplay."""
-        # Check if an option was clicked
-        for i in range(len(self.game_state.options)):
-            y_pos = 250 + i * OPTION_VERTICAL_SPACING
-            option_box = pygame.Rect(
-                WINDOW_WIDTH/2 - OPTION_BOX_WIDTH/2, 
-                y_pos, 
-                OPTION_BOX_WIDTH, 
-                OPTION_BOX_HEIGHT
-            )
-            
-            if option_box.collidepoint(pos):
-                self.game_state.selected_option = i
-                is_correct = (i == self.game_state.correct_option)
-                
-                if is_correct:
-                    self.game_state.score += 10
-                
-                self._show_feedback(is_correct)
+    def _handle_playing_click(self, option):
+        """Answer the question with the clicked option, if one was clicked."""
+        if option is None:
+            return
+        
+        reaction_time = self.engine.reaction_time()
+        is_correct = self.engine.answer(option)
+        self.analytics.log(
+            'answer',
+            service=self.game_state.current_service.name,
+            option=self.engine.option_descriptions()[option],
+            correct=is_correct,
+            reaction_ms=reaction_time
+        )
+        
+        # Compose the frozen feedback screen once, as the answer is given
+        self.compositor.invalidate('feedback')
+        if self.drawing:
+            self.compositor.refresh('feedback')
+    
+    def _log_transition(self, old_state, new_state):
+        """Record a game state change in the analytics log."""
+        self.analytics.log(
+            'state',
+            old=STATE_NAMES[old_state],
+            new=STATE_NAMES[new_state],
+            score=self.game_state.score
+        )
+    
+    def _scene_key(self):
+        """Return the values that, when changed, require a full redraw."""
+        service = self.game_state.current_service
+        return (
+            self.game_state.state,
+            self.game_state.score,
+            service.name if service else None,
+            tuple(self.game_state.options),
+            self.game_state.selected_option,
+            self.game_state.feedback_message,
+            # The leaderboard changes when a score is recorded or the saved scores finish loading
+            self.high_scores.version
+        )
     
     def _draw_current_state(self):
         """Draw the current game state."""
+        profiler = self.profiler
         if self.game_state.state == MENU:
-            self._draw_menu()
+            with profiler.phase('draw.menu'):
+                self._draw_menu()
         elif self.game_state.state == PLAYING:
-            self._draw_game()
-            # Check if time's up
-            elapsed_time = (pygame.time.get_ticks() - self.game_state.start_time - 
-                           self.game_state.total_pause_time) // 1000
-            if elapsed_time >= GAME_DURATION:
-                self.game_state.state = GAME_OVER
+            with profiler.phase('draw.game'):
+                self._draw_game()
         elif self.game_state.state == FEEDBACK:
-            self._draw_game()  # Draw the game screen with selected option highlighted
-            self._draw_feedback()  # Draw the feedback on top
+            with profiler.phase('draw.feedback'):
+                self._draw_feedback()
         elif self.game_state.state == GAME_OVER:
-            self._draw_game_over()
+            with profiler.phase('draw.game_over'):
+                self._draw_game_over()
+    
+    def _init_layers(self):
+        """Set up the cached layers for static screen content."""
+        self.compositor = Compositor(self.window)
+        
+        self.compositor.add('menu_text', Layer(self._render_menu_text, transparent=True))
+        self.compositor.add('game', Layer(
+            self._render_game_background,
+            key=self._game_layer_key
+        ))
+        self.compositor.add('feedback', Layer(
+            self._render_feedback,
+            key=lambda: (self.game_state.feedback_message, f"Score: {self.game_state.score}")
+        ))
+        self.compositor.add('game_over', Layer(
+            self._render_game_over,
+            key=lambda: (self.game_state.score, self.high_scores.version)
+        ))
+    
+    def _game_layer_key(self):
+        """Return what the cached game screen depends on."""
+        state = self.game_state
+        return (
+            state.score,
+            state.current_service.name,
+            state.current_service.color,
+            tuple(state.options),
+            state.selected_option
+        )
+    
+    def _init_widgets(self):
+        """Set up the clickable areas of each screen."""
+        self.widgets = {
+            MENU: WidgetLayer(self._layout_menu),
+            PLAYING: WidgetLayer(self._layout_options, key=lambda: len(self.game_state.options)),
+            GAME_OVER: WidgetLayer(self._layout_game_over)
+        }
+    
+    def _layout_menu(self, widgets):
+        """Lay out the menu's start button, whose pulse at the frame time decides what counts as a hit."""
+        widgets.add('start', self.start_button.bounds, lambda pos: self.start_button.is_clicked(pos, self.frame_time))
+    
+    def _layout_options(self, widgets):
+        """Lay out one box per answer option."""
+        for i in range(len(self.game_state.options)):
+            widgets.add(i, (
+                WINDOW_WIDTH/2 - OPTION_BOX_WIDTH/2,
+                250 + i * OPTION_VERTICAL_SPACING,
+                OPTION_BOX_WIDTH,
+                OPTION_BOX_HEIGHT
+            ))
+    
+    def _layout_game_over(self, widgets):
+        """Lay out the game over buttons."""
+        widgets.add('play_again', self.play_again_button.bounds)
+        widgets.add('menu', self.menu_button.bounds)
     
     def _draw_menu(self):
         """Draw the main menu screen."""
         self.window.fill(LIGHT_BLUE)  # Lighter blue for sky background
         
         # Draw animated AWS-themed elements
-        self.animation_manager.draw()
+        self.renderer.mark_all(self.animation_manager.draw())
         
+        # Title and description on top of the animations
+        self.compositor.draw('menu_text')
+        
+        # Draw start button
+        self.renderer.mark(self.start_button.draw(self.window, self.frame_time))
+    
+    def _render_menu_text(self, surface):
+        """Render the menu title and description."""
         # Title with shadow effect
         TextRenderer.render_text(
-            self.window, 
+            surface, 
             "AWS Cloud Heroes", 
             self.title_font, 
             ORANGE, 
@@ -198,7 +494,7 @@ class Game:
         
         # Description
         TextRenderer.render_text(
-            self.window,
+            surface,
             "Learn about AWS cloud services!",
             self.game_font,
             BLACK,
@@ -206,40 +502,44 @@ class Game:
         )
         
         TextRenderer.render_text(
-            self.window,
+            surface,
             "Match the service with what it does.",
             self.game_font,
             BLACK,
             (WINDOW_WIDTH/2, 240)
         )
-        
-        # Draw start button
-        self.start_button.draw(self.window)
     
     def _draw_game(self):
         """Draw the main gameplay screen."""
-        self.window.fill(BLUE)
+        # Background, score, service and options only change between questions
+        self.compositor.draw('game')
         
-        # Draw time and score
-        elapsed_time = (pygame.time.get_ticks() - self.game_state.start_time - 
-                       self.game_state.total_pause_time) // 1000
-        time_remaining = max(0, GAME_DURATION - elapsed_time)
+        # Draw time
+        self.renderer.mark(self._draw_time(self.window))
+    
+    def _draw_time(self, surface):
+        """Draw the time remaining and return the area it covers."""
+        time_remaining = self.engine.time_remaining()
         
-        TextRenderer.render_text(
-            self.window,
+        return TextRenderer.render_text(
+            surface,
             f"Time: {time_remaining}s",
             self.game_font,
             BLACK,
             (20, 20),
             center=False
         )
+    
+    def _render_game_background(self, surface):
+        """Render the parts of the gameplay screen that change only between questions."""
+        surface.fill(BLUE)
         
         # Draw score more prominently
         score_box = pygame.Rect(WINDOW_WIDTH - 200, 10, 180, 40)
-        pygame.draw.rect(self.window, WHITE, score_box, 0, 10)
+        pygame.draw.rect(surface, WHITE, score_box, 0, 10)
         
         TextRenderer.render_text(
-            self.window,
+            surface,
             f"Score: {self.game_state.score}",
             self.game_font,
             BLACK,
@@ -247,12 +547,12 @@ class Game:
         )
         
         # Draw the service name
-        self._draw_service_box()
+        self._draw_service_box(surface)
         
         # Draw the options
-        self._draw_options()
+        self._draw_options(surface)
     
-    def _draw_service_box(self):
+    def _draw_service_box(self, surface):
         """Draw the service box with the current service name."""
         service_box = pygame.Rect(
             WINDOW_WIDTH/2 - SERVICE_BOX_WIDTH/2, 
@@ -268,27 +568,22 @@ class Game:
             SERVICE_BOX_WIDTH + 10, 
             SERVICE_BOX_HEIGHT + 10
         )
-        pygame.draw.rect(self.window, BLACK, border_box, 0, 12)
-        pygame.draw.rect(self.window, self.game_state.current_service["color"], service_box, 0, 10)
+        pygame.draw.rect(surface, BLACK, border_box, 0, 12)
+        pygame.draw.rect(surface, self.game_state.current_service.color, service_box, 0, 10)
         
         TextRenderer.render_text(
-            self.window,
-            self.game_state.current_service["name"],
+            surface,
+            self.game_state.current_service.name,
             self.title_font,
             WHITE,
             service_box.center
         )
     
-    def _draw_options(self):
+    def _draw_options(self, surface):
         """Draw the answer options."""
-        for i, option in enumerate(self.game_state.options):
-            y_pos = 250 + i * OPTION_VERTICAL_SPACING
-            option_box = pygame.Rect(
-                WINDOW_WIDTH/2 - OPTION_BOX_WIDTH/2, 
-                y_pos, 
-                OPTION_BOX_WIDTH, 
-                OPTION_BOX_HEIGHT
-            )
+        option_widgets = self.widgets[PLAYING]
+        for i, option in enumerate(self.engine.option_descriptions()):
+            option_box = option_widgets.rect(i)
             
             # Highlight selected option
             if i == self.game_state.selected_option:
@@ -299,30 +594,38 @@ class Game:
             else:
                 box_color = WHITE      # Unselected
                 
-            pygame.draw.rect(self.window, box_color, option_box, 0, 10)
+            pygame.draw.rect(surface, box_color, option_box, 0, 10)
             
-            TextRenderer.render_text(
-                self.window,
-                option,
-                self.game_font,
+            # Long descriptions wrap and shrink to stay inside the box
+            TextRenderer.render_layout(
+                surface,
+                fit_option_text(option),
                 BLACK,
                 option_box.center
             )
     
     def _draw_feedback(self):
         """Draw feedback overlay after an answer is selected."""
+        # The dimmed game screen and feedback box do not change during the pause
+        self.compositor.draw('feedback')
+    
+    def _render_feedback(self, surface):
+        """Render the game screen with the selected option highlighted and the feedback on top."""
+        self.compositor.layers['game'].draw(surface)
+        self._draw_time(surface)
+        
         # Create a semi-transparent black overlay
         self.overlay.fill((0, 0, 0, 180))  # Black with 70% opacity
-        self.window.blit(self.overlay, (0, 0))
+        surface.blit(self.overlay, (0, 0))
         
         # Create a feedback box
         feedback_box = pygame.Rect(WINDOW_WIDTH/2 - 200, WINDOW_HEIGHT/2 - 100, 400, 200)
-        pygame.draw.rect(self.window, DARK_GRAY, feedback_box, 0, 15)  # Dark gray box with rounded corners
-        pygame.draw.rect(self.window, self.game_state.feedback_color, feedback_box, 4, 15)  # Colored border
+        pygame.draw.rect(surface, DARK_GRAY, feedback_box, 0, 15)  # Dark gray box with rounded corners
+        pygame.draw.rect(surface, self.game_state.feedback_color, feedback_box, 4, 15)  # Colored border
         
         # Draw the feedback message
         TextRenderer.render_text(
-            self.window,
+            surface,
             self.game_state.feedback_message,
             self.feedback_font,
             self.game_state.feedback_color,
@@ -331,28 +634,25 @@ class Game:
         
         # Draw current score
         TextRenderer.render_text(
-            self.window,
+            surface,
             f"Score: {self.game_state.score}",
             self.feedback_font,
             WHITE,
             (WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 20)
         )
-        
-        # Check if feedback time is over
-        current_time = pygame.time.get_ticks()
-        if current_time - self.game_state.feedback_start_time >= FEEDBACK_DURATION:
-            # Add the pause duration to total_pause_time before moving on
-            self.game_state.total_pause_time += (current_time - self.game_state.pause_time)
-            self._new_question()
-            self.game_state.state = PLAYING
     
     def _draw_game_over(self):
         """Draw the game over screen."""
-        self.window.fill(BLUE)
+        # Nothing on this screen moves, so it is a single cached layer
+        self.compositor.draw('game_over')
+    
+    def _render_game_over(self, surface):
+        """Render the game over screen."""
+        surface.fill(BLUE)
         
         # Game over text
         TextRenderer.render_text(
-            self.window,
+            surface,
             "Game Over!",
             self.title_font,
             ORANGE,
@@ -362,7 +662,7 @@ class Game:
         
         # Final score
         TextRenderer.render_text(
-            self.window,
+            surface,
             f"Your Score: {self.game_state.score}",
             self.game_font,
             BLACK,
@@ -370,69 +670,38 @@ class Game:
         )
         
         # Draw buttons
-        self.play_again_button.draw(self.window)
-        self.menu_button.draw(self.window)
-    
-    def _start_game(self):
-        """Initialize a new game."""
-        self.game_state.state = PLAYING
-        self.game_state.score = 0
-        self.game_state.start_time = pygame.time.get_ticks()
-        self.game_state.total_pause_time = 0
-        self._new_question()
-    
-    def _reset_game_state(self):
-        """Reset the game state for a new question."""
-        self.game_state.selected_option = -1
-    
-    def _select_random_service(self):
-        """Select a random AWS service to quiz the player on."""
-        return random.choice(AWS_SERVICES)
-    
-    def _generate_answer_options(self, correct_description):
-        """Generate a list of answer options (one correct, three wrong)."""
-        # Remove the correct answer from potential wrong answers
-        wrong_descriptions = [desc for desc in self.all_descriptions if desc != correct_description]
+        self.play_again_button.draw(surface)
+        self.menu_button.draw(surface)
         
-        # Select 3 random wrong descriptions
-        selected_wrong = random.sample(wrong_descriptions, min(3, len(wrong_descriptions)))
-        
-        # Combine with correct and shuffle
-        options = [correct_description] + selected_wrong
-        random.shuffle(options)
-        
-        return options
+        self._draw_high_scores(surface)
     
-    def _find_correct_option_index(self, options, correct_description):
-        """Find the index of the correct option in the options list."""
-        return options.index(correct_description)
-    
-    def _new_question(self):
-        """Set up a new question for the player."""
-        # Reset game state
-        self._reset_game_state()
-        
-        # Select a random service
-        self.game_state.current_service = self._select_random_service()
-        correct_description = self.game_state.current_service["description"]
+    def _draw_high_scores(self, surface):
+        """Draw the top scores in two columns below the buttons."""
+        top_scores = self.high_scores.top_scores()
+        if not top_scores:
+            return
         
-        # Generate answer options
-        self.game_state.options = self._generate_answer_options(correct_description)
-        
-        # Track the correct option
-        self.game_state.correct_option = self._find_correct_option_index(
-            self.game_state.options, correct_description
+        TextRenderer.render_text(
+            surface,
+            "High Scores",
+            self.game_font,
+            ORANGE,
+            (WINDOW_WIDTH/2, 450),
+            shadow=True,
+            shadow_offset=(1, 1)
         )
+        
+        rows = (self.high_scores.top_count + 1) // 2
+        for i, (score, player, _) in enumerate(top_scores):
+            column, row = divmod(i, rows)
+            TextRenderer.render_text(
+                surface,
+                f"{i + 1}. {player}  {score}",
+                self.button_font,
+                BLACK,
+                (WINDOW_WIDTH/2 - 150 + column * 300, 480 + row * 22)
+            )
     
-    def _show_feedback(self, is_correct):
-        """Show feedback after an answer is selected."""
-        if is_correct:
-            self.game_state.feedback_message = "CORRECT!"
-            self.game_state.feedback_color = GREEN
-        else:
-            self.game_state.feedback_message = "WRONG!"
-            self.game_state.feedback_color = RED
-        
-        self.game_state.state = FEEDBACK
-        self.game_state.feedback_start_time = pygame.time.get_ticks()
-        self.game_state.pause_time = pygame.time.get_ticks()  # Record when feedback started
+    def _start_game(self):
+        """Initialize a new game."""
+        self.engine.start_game()
@@ -0,0 +1,156 @@
+"""
+High score storage for AWS Cloud Heroes game.
+Contains a SQLite leaderboard written by a background thread so the game loop never waits on disk.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from config import *
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, played_at);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, score DESC);
+"""
+
+# Tells the writer thread to flush and exit
+_STOP = object()
+
+class HighScoreStore:
+    """Leaderboard backed by SQLite with write-behind persistence.
+    
+    Scores are added to an in-memory top list immediately and queued for a
+    background thread that writes them in batches. Reads for the game screens
+    come from the in-memory list only.
+    """
+    
+    def __init__(self, path=HIGH_SCORE_FILE, top_count=HIGH_SCORE_TOP_COUNT):
+        if path and not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        self.path = path
+        self.top_count = top_count
+        self.top = []
+        self.version = 0
+        # The writer thread merges the saved scores while the game may be recording new ones
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.writer = None
+        
+        if not path:
+            return
+        
+        # The existing scores are read by the writer thread so startup never waits on disk
+        self.writer = threading.Thread(target=self._write_loop, name="high-score-writer", daemon=True)
+        self.writer.start()
+        
+        # Flush queued scores even if the game exits without closing the store
+        atexit.register(self.close)
+    
+    def record(self, player, score):
+        """Add a score to the leaderboard without waiting for it to be saved."""
+        entry = (score, player, time.time())
+        
+        # Insert into the cached top list
+        with self.lock:
+            if len(self.top) < self.top_count or score > self.top[-1][0]:
+                self._merge_top([entry])
+        
+        if self.writer is not None and self.path is not None:
+            self.queue.put(entry)
+    
+    def top_scores(self):
+        """Return the cached top scores as (score, player, played_at) tuples."""
+        return self.top
+    
+    def player_scores(self, player, limit=HIGH_SCORE_TOP_COUNT):
+        """Return a player's best saved scores. This reads the database, so keep it off the game loop."""
+        if self.path is None:
+            return [entry for entry in self.top if entry[1] == player][:limit]
+        connection = self._connect()
+        try:
+            return connection.execute(
+                "SELECT score, player, played_at FROM scores WHERE player = ? ORDER BY score DESC LIMIT ?",
+                (player, limit)
+            ).fetchall()
+        finally:
+            connection.close()
+    
+    def close(self):
+        """Save every queued score and stop the writer thread."""
+        if self.writer is not None:
+            self.queue.put(_STOP)
+            self.writer.join()
+            self.writer = None
+    
+    def _merge_top(self, entries):
+        """Add entries to the cached top list, highest score first and oldest first on ties. Call with the lock held."""
+        top = sorted(self.top + list(entries), key=lambda item: (-item[0], item[2]))
+        self.top = top[:self.top_count]
+        self.version += 1
+    
+    def _connect(self):
+        """Open a connection to the database."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+    
+    def _load_top(self):
+        """Create the schema if needed and read the current top scores."""
+        connection = self._connect()
+        try:
+            connection.executescript(SCHEMA)
+            return connection.execute(
+                "SELECT score, player, played_at FROM scores ORDER BY score DESC, played_at LIMIT ?",
+                (self.top_count,)
+            ).fetchall()
+        finally:
+            connection.close()
+    
+    def _write_loop(self):
+        """Load the saved top scores, then write queued scores in batches until told to stop."""
+        try:
+            saved = self._load_top()
+            with self.lock:
+                self._merge_top(saved)
+        except sqlite3.Error as e:
+            # Keep the scores in memory only if the database cannot be used
+            print(f"High scores will not be saved: {e}")
+            self.path = None
+            return
+        
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            
+            # Gather whatever else arrives shortly after so it shares one commit
+            while len(batch) < HIGH_SCORE_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get(timeout=HIGH_SCORE_BATCH_WINDOW))
+                except queue.Empty:
+                    break
+            
+            if _STOP in batch:
+                stopping = True
+                batch = [entry for entry in batch if entry is not _STOP]
+            
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO scores (score, player, played_at) VALUES (?, ?, ?)", batch
+                        )
+                except sqlite3.Error as e:
+                    print(f"Error saving high scores: {e}")
+        
+        connection.close()
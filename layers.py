@@ -0,0 +1,95 @@
+"""
+Layer compositing for AWS Cloud Heroes game.
+Contains cached layers for static screen content that only re-render when their inputs change.
+"""
+
+import pygame
+from config import *
+
+# Marks a layer that has never been rendered
+_NOT_RENDERED = object()
+
+class Layer:
+    """Static content rendered once into a cached surface.
+    
+    The layer re-renders only when the value returned by its key function
+    changes, or after it has been invalidated.
+    """
+    
+    def __init__(self, render, key=None, transparent=False, size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
+        self.render = render
+        self.key = key
+        self.transparent = transparent
+        self.size = size
+        self.surface = None
+        self.offset = (0, 0)
+        self.cached_key = _NOT_RENDERED
+        self.renders = 0
+    
+    def invalidate(self):
+        """Force the layer to re-render the next time it is drawn."""
+        self.cached_key = _NOT_RENDERED
+    
+    def refresh(self):
+        """Re-render the layer now if its inputs changed and return its surface."""
+        key = self.key() if self.key is not None else None
+        if key != self.cached_key or not LAYER_CACHING:
+            self._render()
+            self.cached_key = key
+        return self.surface
+    
+    def draw(self, target):
+        """Blit the layer onto the target, re-rendering it first if its inputs changed."""
+        return target.blit(self.refresh(), self.offset)
+    
+    def _render(self):
+        """Render the layer content into its cached surface."""
+        if self.transparent:
+            surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface(self.size)
+        self.render(surface)
+        self.renders += 1
+        
+        # Transparent layers only keep the area that has content
+        offset = (0, 0)
+        if self.transparent:
+            bounds = surface.get_bounding_rect()
+            surface = surface.subsurface(bounds).copy()
+            offset = bounds.topleft
+        
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if self.transparent else surface.convert()
+        
+        self.surface = surface
+        self.offset = offset
+
+class Compositor:
+    """A named set of layers composed onto a target surface."""
+    
+    def __init__(self, target):
+        self.target = target
+        self.layers = {}
+    
+    def add(self, name, layer):
+        """Register a layer under a name."""
+        self.layers[name] = layer
+        return layer
+    
+    def draw(self, name):
+        """Blit the named layer onto the target and return the area covered."""
+        return self.layers[name].draw(self.target)
+    
+    def refresh(self, name):
+        """Re-render the named layer now if its inputs changed."""
+        return self.layers[name].refresh()
+    
+    def invalidate(self, name=None):
+        """Invalidate the named layer, or every layer if no name is given."""
+        layers = [self.layers[name]] if name is not None else self.layers.values()
+        for layer in layers:
+            layer.invalidate()
+    
+    def stats(self):
+        """Return how many times each layer has been rendered."""
+        return {name: layer.renders for name, layer in self.layers.items()}
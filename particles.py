@@ -0,0 +1,71 @@
+"""
+Array-backed particle engine for AWS Cloud Heroes game.
+Stores animated elements as NumPy columns so updates run as vectorized operations.
+"""
+
+from config import *
+
+# NumPy is optional and slow to import, so it is only loaded when an engine is built
+np = None
+
+def load_numpy():
+    """Import NumPy on first use and return it, or None if it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            # AnimationManager falls back to per-element updates
+            return None
+        np = numpy
+    return np
+
+class ParticleGroup:
+    """A group of elements stored as one array per attribute."""
+    
+    COLUMNS = ('x', 'y', 'size', 'speed', 'angle', 'direction')
+    
+    def __init__(self, elements):
+        count = len(elements)
+        self.x = np.fromiter((e.x for e in elements), dtype=np.float64, count=count)
+        self.y = np.fromiter((e.y for e in elements), dtype=np.float64, count=count)
+        self.size = np.fromiter((e.size for e in elements), dtype=np.int64, count=count)
+        self.speed = np.fromiter((e.speed for e in elements), dtype=np.float64, count=count)
+        self.angle = np.fromiter((getattr(e, 'angle', 0) for e in elements), dtype=np.float64, count=count)
+        self.direction = np.fromiter((getattr(e, 'direction', 1) for e in elements), dtype=np.float64, count=count)
+    
+    def __len__(self):
+        return len(self.x)
+    
+    def rows(self, *columns):
+        """Return the given columns as plain Python tuples, one per element."""
+        return zip(*(getattr(self, column).tolist() for column in columns))
+
+class ParticleEngine:
+    """Vectorized updates for clouds, stars and lambda symbols."""
+    
+    def __init__(self, clouds, stars, lambda_functions, seed=None):
+        load_numpy()
+        self.clouds = ParticleGroup(clouds)
+        self.stars = ParticleGroup(stars)
+        self.lambda_functions = ParticleGroup(lambda_functions)
+        self.rng = np.random.default_rng(seed)
+    
+    def update(self):
+        """Advance every element by one frame."""
+        # Clouds drift right and wrap around at a new height
+        clouds = self.clouds
+        clouds.x += clouds.speed
+        wrapped = clouds.x > WINDOW_WIDTH + clouds.size
+        if wrapped.any():
+            clouds.x[wrapped] = -clouds.size[wrapped]
+            clouds.y[wrapped] = self.rng.integers(50, 151, int(wrapped.sum()))
+        
+        # Stars rotate in place
+        self.stars.angle += self.stars.speed
+        
+        # Lambdas move sideways and bounce off the screen margins
+        lambdas = self.lambda_functions
+        lambdas.x += lambdas.speed * lambdas.direction
+        bounced = (lambdas.x > WINDOW_WIDTH - 50) | (lambdas.x < 50)
+        lambdas.direction[bounced] *= -1
@@ -0,0 +1,192 @@
+"""
+Frame profiling for AWS Cloud Heroes game.
+Contains per-phase timers with rolling histograms, an on-screen overlay and trace export.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+import pygame
+from config import *
+from fonts import get_font
+
+# Upper bounds in milliseconds of the histogram buckets (last bucket is open-ended)
+HISTOGRAM_BOUNDS = (0.5, 1, 2, 4, 8, 16.7, 33.3, 66.7)
+
+class RollingHistogram:
+    """Keeps the most recent timings of one phase."""
+    
+    def __init__(self, history=PROFILER_HISTORY):
+        self.samples = deque(maxlen=history)
+    
+    def add(self, ms):
+        """Record one timing in milliseconds."""
+        self.samples.append(ms)
+    
+    def percentile(self, fraction):
+        """Return the nearest-rank percentile of the recorded timings."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+        return ordered[index]
+    
+    def mean(self):
+        """Return the mean of the recorded timings."""
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+    
+    def max(self):
+        """Return the largest recorded timing."""
+        return max(self.samples) if self.samples else 0.0
+    
+    def buckets(self):
+        """Return the number of timings that fall in each histogram bucket."""
+        counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        for ms in self.samples:
+            for i, bound in enumerate(HISTOGRAM_BOUNDS):
+                if ms <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+class PhaseProfiler:
+    """Times the phases of each frame and keeps a rolling histogram per phase."""
+    
+    def __init__(self, history=PROFILER_HISTORY, trace_path=PROFILER_TRACE_FILE):
+        self.history = history
+        self.histograms = {}
+        self.current = {}
+        self.frame = 0
+        self.overlay_visible = False
+        self.trace_file = None
+        self.trace_writer = None
+        if trace_path:
+            self.start_trace(trace_path)
+    
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as the named phase of the current frame."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+    
+    def record(self, name, ms):
+        """Add a timing to the named phase of the current frame."""
+        self.current[name] = self.current.get(name, 0.0) + ms
+    
+    def end_frame(self):
+        """Store the current frame's timings and start a new frame."""
+        for name, ms in self.current.items():
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.history)
+            histogram.add(ms)
+        
+        if self.trace_file is not None:
+            self._write_trace()
+        
+        self.current = {}
+        self.frame += 1
+    
+    def toggle_overlay(self):
+        """Show or hide the on-screen overlay."""
+        self.overlay_visible = not self.overlay_visible
+    
+    def summary(self):
+        """Return p50, p95, p99 and max per phase in milliseconds."""
+        return {
+            name: {
+                'p50_ms': histogram.percentile(0.50),
+                'p95_ms': histogram.percentile(0.95),
+                'p99_ms': histogram.percentile(0.99),
+                'max_ms': histogram.max()
+            }
+            for name, histogram in self.histograms.items()
+        }
+    
+    def draw_overlay(self, surface):
+        """Draw the live phase timings and return the area covered."""
+        font = get_font(PROFILER_FONT_SIZE)
+        rows = [('phase', 'p50', 'p95', 'max')]
+        for name, stats in self.summary().items():
+            rows.append((name, f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}", f"{stats['max_ms']:.2f}"))
+        
+        # Names are left-aligned, timings right-aligned in fixed-width columns
+        line_height = font.get_linesize()
+        name_width = max(font.size(row[0])[0] for row in rows) + 10
+        number_width = font.size('000.00')[0] + 10
+        rect = pygame.Rect(5, 0, name_width + 3 * number_width + 12, len(rows) * line_height + 10)
+        rect.bottom = WINDOW_HEIGHT - 5
+        
+        pygame.draw.rect(surface, DARK_GRAY, rect)
+        for i, row in enumerate(rows):
+            y = rect.y + 5 + i * line_height
+            # Timings change every frame, so they are not worth caching
+            surface.blit(font.render(row[0], True, WHITE), (rect.x + 6, y))
+            for column, text in enumerate(row[1:], start=1):
+                text_surf = font.render(text, True, WHITE)
+                right = rect.x + 6 + name_width + column * number_width
+                surface.blit(text_surf, (right - text_surf.get_width(), y))
+        
+        return rect
+    
+    def start_trace(self, path):
+        """Write every frame's timings to a .csv or .jsonl file."""
+        self.stop_trace()
+        self.trace_file = open(path, 'w', newline='')
+        if os.path.splitext(path)[1].lower() == '.csv':
+            self.trace_writer = csv.writer(self.trace_file)
+            self.trace_writer.writerow(['frame', 'phase', 'ms'])
+        else:
+            self.trace_writer = None
+    
+    def stop_trace(self):
+        """Close the trace file, if any."""
+        if self.trace_file is not None:
+            self.trace_file.close()
+            self.trace_file = None
+            self.trace_writer = None
+    
+    def _write_trace(self):
+        """Append the current frame's timings to the trace file."""
+        if self.trace_writer is not None:
+            for name, ms in self.current.items():
+                self.trace_writer.writerow([self.frame, name, f"{ms:.4f}"])
+        else:
+            self.trace_file.write(json.dumps({'frame': self.frame, 'phases': self.current}) + '\n')
+
+class StartupTimer:
+    """Records how long each step of startup takes."""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self, start=None):
+        """Start timing from the given perf_counter value, or from now."""
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.steps = []
+    
+    def mark(self, name):
+        """Record the time since the previous mark as the named step."""
+        now = time.perf_counter()
+        self.steps.append((name, (now - self.last) * 1000))
+        self.last = now
+    
+    def report(self):
+        """Return the step timings and the total as printable text."""
+        lines = ["Startup timing:"]
+        for name, ms in self.steps:
+            lines.append(f"  {name:<14}{ms:9.1f} ms")
+        lines.append(f"  {'total':<14}{(self.last - self.start) * 1000:9.1f} ms")
+        return '\n'.join(lines)
+
+# Shared timer covering the launch of the game
+startup_timer = StartupTimer()
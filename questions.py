@@ -0,0 +1,158 @@
+"""
+Question bank for AWS Cloud Heroes game.
+Contains loading of AWS services from data files and sampling of answer options.
+"""
+
+import csv
+import json
+import os
+from config import *
+
+REQUIRED_FIELDS = ('name', 'description')
+DEFAULT_COLOR = ORANGE
+DEFAULT_CATEGORY = "General"
+DEFAULT_DIFFICULTY = 1
+
+def parse_color(value):
+    """Parse a color given as an RGB list, "r,g,b" or "#rrggbb"."""
+    if not value:
+        return DEFAULT_COLOR
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('#'):
+            return tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+        value = value.replace(' ', ',').split(',')
+        value = [part for part in value if part]
+    return tuple(int(part) for part in value[:3])
+
+class Service:
+    """One service in a bank, referring to its description by id."""
+    
+    __slots__ = ('name', 'description_id', 'color', 'category', 'difficulty')
+    
+    def __init__(self, name, description_id, color, category, difficulty):
+        self.name = name
+        self.description_id = description_id
+        self.color = color
+        self.category = category
+        self.difficulty = difficulty
+
+class QuestionBank:
+    """The services players are quizzed on, with index-based answer sampling."""
+    
+    def __init__(self, services):
+        self.services = []
+        self.descriptions = []
+        
+        # Store each distinct description, color and category once and refer to it
+        description_index = {}
+        shared = {}
+        for service in services:
+            service = self._normalize(service)
+            description = service["description"]
+            description_id = description_index.get(description)
+            if description_id is None:
+                description_id = description_index[description] = len(self.descriptions)
+                self.descriptions.append(description)
+            self.services.append(Service(
+                service["name"],
+                description_id,
+                shared.setdefault(service["color"], service["color"]),
+                shared.setdefault(service["category"], service["category"]),
+                service["difficulty"]
+            ))
+        
+        if not self.services:
+            raise ValueError("Question bank has no services")
+    
+    @classmethod
+    def load(cls, path):
+        """Load a bank from a .json or .csv file."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.json':
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            # Accept either a bare list or {"services": [...]}
+            if isinstance(data, dict):
+                data = data.get('services', [])
+            return cls(data)
+        if extension == '.csv':
+            with open(path, newline='', encoding='utf-8') as f:
+                return cls(csv.DictReader(f))
+        raise ValueError(f"Unsupported question bank format: {path}")
+    
+    @staticmethod
+    def default_path():
+        """Return the configured bank file if it exists, or None to use the built-in services."""
+        if QUESTION_BANK_FILE:
+            path = QUESTION_BANK_FILE
+            if not os.path.isabs(path):
+                path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+            if os.path.exists(path):
+                return path
+        return None
+    
+    @classmethod
+    def default(cls):
+        """Load the configured bank file, falling back to the built-in services."""
+        path = cls.default_path()
+        if path:
+            return cls.load(path)
+        return cls(AWS_SERVICES)
+    
+    def __len__(self):
+        return len(self.services)
+    
+    def to_dict(self, service):
+        """Return a service as the dict it was loaded from."""
+        return {
+            "name": service.name,
+            "description": self.descriptions[service.description_id],
+            "color": service.color,
+            "category": service.category,
+            "difficulty": service.difficulty
+        }
+    
+    def filter(self, category=None, max_difficulty=None):
+        """Return a new bank with only the services in a category or up to a difficulty."""
+        return QuestionBank([
+            self.to_dict(service) for service in self.services
+            if (category is None or service.category == category)
+            and (max_difficulty is None or service.difficulty <= max_difficulty)
+        ])
+    
+    def random_index(self, rng):
+        """Return the index of a uniformly chosen service."""
+        return rng.randrange(len(self.services))
+    
+    def sample_distractors(self, rng, correct_id, count=3):
+        """Return up to count distinct description ids other than correct_id."""
+        total = len(self.descriptions)
+        count = min(count, total - 1)
+        
+        # Small banks: enumerate the candidates directly
+        if total <= 2 * (count + 1):
+            candidates = [i for i in range(total) if i != correct_id]
+            return rng.sample(candidates, count)
+        
+        # Large banks: draw random indexes and reject repeats, with no copies of the bank
+        chosen = []
+        while len(chosen) < count:
+            description_id = rng.randrange(total)
+            if description_id != correct_id and description_id not in chosen:
+                chosen.append(description_id)
+        return chosen
+    
+    @staticmethod
+    def _normalize(service):
+        """Return a service dict with every field present and typed."""
+        for field in REQUIRED_FIELDS:
+            if not service.get(field):
+                raise ValueError(f"Service is missing '{field}': {service!r}")
+        return {
+            "name": service["name"],
+            "description": service["description"],
+            "color": parse_color(service.get("color")),
+            "category": service.get("category") or DEFAULT_CATEGORY,
+            "difficulty": int(service.get("difficulty") or DEFAULT_DIFFICULTY)
+        }
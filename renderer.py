@@ -0,0 +1,235 @@
+"""
+Display presentation for AWS Cloud Heroes game.
+Contains the dirty-rectangle renderer that limits display updates to changed areas,
+and the scaler that presents the logical-resolution canvas on a display of another size.
+"""
+
+import math
+import pygame
+from config import *
+
+class ScaledDisplay:
+    """Presents a canvas at the logical resolution on a display of a different size.
+    
+    The canvas is scaled to fit the display without changing its aspect ratio.
+    It is filtered at the render scale, a fraction of the display resolution,
+    and then enlarged to the display with a cheap pixel-repeating scale. The
+    render scale drops while frames go over budget and rises again when they
+    have headroom.
+    """
+    
+    def __init__(self, display, logical_size=(WINDOW_WIDTH, WINDOW_HEIGHT), budget_ms=RENDER_FRAME_BUDGET,
+                 headroom=RENDER_SCALE_HEADROOM, min_scale=RENDER_SCALE_MIN, step=RENDER_SCALE_STEP,
+                 window=RENDER_SCALE_WINDOW):
+        self.display = display
+        self.canvas = pygame.Surface(logical_size).convert(display)
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.min_scale = min_scale
+        self.step = step
+        self.window = window
+        self.frame_times = []
+        self.scale_changes = 0
+        
+        # Largest area of the display with the canvas's aspect ratio, centered
+        width, height = logical_size
+        self.factor = min(display.get_width() / width, display.get_height() / height)
+        fit_size = (round(width * self.factor), round(height * self.factor))
+        self.fit_rect = pygame.Rect((0, 0), fit_size)
+        self.fit_rect.center = display.get_rect().center
+        
+        # The bars around the canvas are cleared on the first full update
+        self.clear_bars = self.fit_rect != display.get_rect()
+        
+        self.render_scale = None
+        self.set_render_scale(1.0)
+    
+    def set_render_scale(self, scale):
+        """Change the fraction of the display resolution the canvas is filtered at."""
+        scale = min(1.0, max(self.min_scale, scale))
+        if scale == self.render_scale:
+            return
+        self.render_scale = scale
+        
+        # At full scale the canvas is filtered straight onto the display
+        if scale == 1.0:
+            self.frame = self.display.subsurface(self.fit_rect)
+        else:
+            size = (max(1, round(self.fit_rect.width * scale)), max(1, round(self.fit_rect.height * scale)))
+            self.frame = pygame.Surface(size).convert(self.display)
+        self.redraw_all = True
+    
+    def record_frame(self, ms):
+        """Add a frame time and adjust the render scale once enough frames are collected."""
+        self.frame_times.append(ms)
+        if len(self.frame_times) < self.window:
+            return
+        
+        average = sum(self.frame_times) / len(self.frame_times)
+        self.frame_times = []
+        if average > self.budget_ms and self.render_scale > self.min_scale:
+            self.set_render_scale(self.render_scale - self.step)
+            self.scale_changes += 1
+        elif average < self.budget_ms * self.headroom and self.render_scale < 1.0:
+            self.set_render_scale(self.render_scale + self.step)
+            self.scale_changes += 1
+    
+    def to_logical(self, pos):
+        """Map a display position to canvas coordinates."""
+        return (int((pos[0] - self.fit_rect.x) / self.factor), int((pos[1] - self.fit_rect.y) / self.factor))
+    
+    def to_display(self, pos):
+        """Map a canvas position to display coordinates."""
+        return (int(pos[0] * self.factor + self.fit_rect.x), int(pos[1] * self.factor + self.fit_rect.y))
+    
+    def present(self, rects):
+        """Scale the given canvas areas, or all of it for None, onto the display.
+        
+        Returns the display areas to update, or None to update the whole display.
+        """
+        if rects is None or self.redraw_all:
+            self.redraw_all = False
+            if self.clear_bars:
+                self.clear_bars = False
+                self.display.fill(BLACK)
+            self._scale(self.canvas.get_rect())
+            return None
+        
+        canvas_rect = self.canvas.get_rect()
+        updated = []
+        for rect in rects:
+            # Include a pixel around each area so the filter blends it into its surroundings
+            rect = rect.inflate(2, 2).clip(canvas_rect)
+            if rect.width and rect.height:
+                updated.append(self._scale(rect))
+        return updated
+    
+    def _scale(self, rect):
+        """Scale one canvas area onto the display and return the display area it covers."""
+        frame_rect = self._map(rect, self.factor * self.render_scale).clip(self.frame.get_rect())
+        pygame.transform.smoothscale(self.canvas.subsurface(rect), frame_rect.size, self.frame.subsurface(frame_rect))
+        
+        if self.render_scale == 1.0:
+            return frame_rect.move(self.fit_rect.topleft)
+        
+        display_rect = self._map(frame_rect, 1 / self.render_scale).clip(pygame.Rect((0, 0), self.fit_rect.size))
+        display_rect.move_ip(self.fit_rect.topleft)
+        pygame.transform.scale(self.frame.subsurface(frame_rect), display_rect.size, self.display.subsurface(display_rect))
+        return display_rect
+    
+    @staticmethod
+    def _map(rect, factor):
+        """Return the rect scaled by factor, grown to whole pixels."""
+        left = math.floor(rect.left * factor)
+        top = math.floor(rect.top * factor)
+        return pygame.Rect(left, top, math.ceil(rect.right * factor) - left, math.ceil(rect.bottom * factor) - top)
+
+class DirtyRectRenderer:
+    """Collects the areas changed by each frame and pushes only those to the display."""
+    
+    def __init__(self, surface, enabled=DIRTY_RECT_RENDERING, max_area_ratio=DIRTY_RECT_MAX_AREA, scaler=None):
+        self.surface = surface
+        # Scales the canvas onto the display when they differ in size
+        self.scaler = scaler
+        self.enabled = enabled
+        self.max_area = surface.get_width() * surface.get_height() * max_area_ratio
+        self.rects = []
+        self.previous_rects = []
+        self.full_update = True
+        self.scene_key = None
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.skipped_frames = 0
+    
+    def begin_frame(self, scene_key):
+        """Start a frame, forcing a full update when the scene has changed."""
+        if scene_key != self.scene_key:
+            self.scene_key = scene_key
+            self.full_update = True
+    
+    def mark(self, rect):
+        """Record an area that changed this frame."""
+        if rect is not None:
+            self.rects.append(pygame.Rect(rect))
+    
+    def mark_all(self, rects):
+        """Record several changed areas."""
+        for rect in rects:
+            self.mark(rect)
+    
+    def invalidate(self):
+        """Force the next frame to update the whole display."""
+        self.full_update = True
+    
+    def present(self):
+        """Push this frame's changes to the display."""
+        # Areas drawn last frame must be refreshed too so moved elements are erased
+        rects = self._merge(self.rects + self.previous_rects)
+        self.previous_rects = self.rects
+        self.rects = []
+        
+        if not self.enabled or self.full_update or self._area(rects) > self.max_area:
+            self.full_update = False
+            self.full_frames += 1
+            self._update(None)
+            return
+        
+        screen_rect = self.surface.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects]
+        rects = [rect for rect in rects if rect.width and rect.height]
+        if rects:
+            self.partial_frames += 1
+            self._update(rects)
+        else:
+            self.skipped_frames += 1
+    
+    def _update(self, rects):
+        """Update the given canvas areas on the display, or the whole display for None."""
+        if self.scaler is not None:
+            rects = self.scaler.present(rects)
+        
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+    
+    def stats(self):
+        """Return how many frames used full, partial or no display updates."""
+        stats = {
+            'full_frames': self.full_frames,
+            'partial_frames': self.partial_frames,
+            'skipped_frames': self.skipped_frames
+        }
+        if self.scaler is not None:
+            stats['render_scale'] = self.scaler.render_scale
+            stats['scale_changes'] = self.scaler.scale_changes
+        return stats
+    
+    @staticmethod
+    def _merge(rects):
+        """Combine overlapping rects whose union is no bigger than the two of them apart.
+        
+        An element that moved a little covers almost the same area in both
+        frames, so its old and new rects become one.
+        """
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect)
+            i = 0
+            while i < len(merged):
+                other = merged[i]
+                union = rect.union(other)
+                if rect.colliderect(other) and union.width * union.height <= rect.width * rect.height + other.width * other.height:
+                    # The grown rect may now overlap rects already passed
+                    rect = union
+                    merged.pop(i)
+                    i = 0
+                else:
+                    i += 1
+            merged.append(rect)
+        return merged
+    
+    @staticmethod
+    def _area(rects):
+        """Return the summed area of the rects, counting overlaps twice."""
+        return sum(rect.width * rect.height for rect in rects)
@@ -0,0 +1,200 @@
+"""
+Session recording and replay for AWS Cloud Heroes.
+Contains the recorder that saves each session's seed and clicks in a compact
+binary file, and a headless replayer that re-drives Game from those files at
+full speed and checks that it reaches the same states and scores.
+
+Replay recordings from the repository root:
+    python replay.py recordings/*.rec
+"""
+
+import argparse
+import atexit
+import os
+import struct
+import sys
+import time
+import pygame
+from config import *
+from analytics import AnalyticsLogger
+from engine import ManualClock
+from highscores import HighScoreStore
+
+RECORDING_MAGIC = b'ACHR'
+RECORDING_VERSION = 1
+
+# File layout: header, then one frame record per frame that had clicks or changed the game,
+# each followed by its clicks
+HEADER = struct.Struct('<4sBQ')  # magic, version, seed
+FRAME = struct.Struct('<IBBI')  # clock time in ms, click count, state after the frame, score after the frame
+CLICK = struct.Struct('<hhB')  # x, y, mouse button
+
+class Recording:
+    """A recorded session: the RNG seed and the frames that mattered."""
+    
+    def __init__(self, seed, frames=None):
+        self.seed = seed
+        # (time, clicks, state, score) per frame, where clicks is a list of (x, y, button)
+        self.frames = frames if frames is not None else []
+    
+    @property
+    def final_state(self):
+        return self.frames[-1][2] if self.frames else MENU
+    
+    @property
+    def final_score(self):
+        return self.frames[-1][3] if self.frames else 0
+
+def read_recording(path):
+    """Load a recording file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    if len(data) < HEADER.size:
+        raise ValueError(f"Not a recording: {path}")
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+        raise ValueError(f"Not a recording: {path}")
+    
+    recording = Recording(seed)
+    position = HEADER.size
+    # A session cut short can leave a partial frame at the end, which is ignored
+    while position + FRAME.size <= len(data):
+        frame_time, click_count, state, score = FRAME.unpack_from(data, position)
+        end = position + FRAME.size + click_count * CLICK.size
+        if end > len(data):
+            break
+        clicks = [CLICK.unpack_from(data, position + FRAME.size + i * CLICK.size) for i in range(click_count)]
+        recording.frames.append((frame_time, clicks, state, score))
+        position = end
+    return recording
+
+class SessionRecorder:
+    """Writes the frames of a session to a recording file as they happen.
+    
+    Only frames with clicks or a change of state or score are written, which
+    is all a replay needs because the other frames leave the engine untouched.
+    """
+    
+    def __init__(self, directory=RECORDING_DIR):
+        if directory and not os.path.isabs(directory):
+            directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), directory)
+        self.directory = directory
+        self.path = None
+        self.file = None
+        self.last = None
+        
+        # Keep the recording of a session that crashes
+        atexit.register(self.close)
+    
+    def begin(self, seed):
+        """Start a new recording file for a session with the given seed."""
+        self.close()
+        self.last = (MENU, 0)
+        if not self.directory:
+            return
+        
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"session-{time.strftime('%Y%m%d-%H%M%S')}-{seed:016x}.rec"
+        self.path = os.path.join(self.directory, name)
+        self.file = open(self.path, 'wb')
+        self.file.write(HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, seed))
+    
+    def frame(self, frame_time, clicks, state, score):
+        """Record a frame if it had clicks or changed the game."""
+        if self.file is None or (not clicks and (state, score) == self.last):
+            return
+        
+        self.last = (state, score)
+        record = FRAME.pack(frame_time, len(clicks), state, score)
+        for x, y, button in clicks:
+            record += CLICK.pack(x, y, button)
+        self.file.write(record)
+    
+    def close(self):
+        """Finish the current recording file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class ReplayResult:
+    """Outcome of replaying one recording."""
+    
+    def __init__(self, frames, mismatch=None):
+        self.frames = frames
+        # (frame index, expected (state, score), actual (state, score)) at the first divergence
+        self.mismatch = mismatch
+    
+    @property
+    def ok(self):
+        return self.mismatch is None
+
+def replay(game, recording):
+    """Re-drive a headless game through a recording and compare every recorded frame.
+    
+    The game must have been created with a ManualClock so each frame can be
+    run at its recorded time; frames in between are skipped, so a replay runs
+    as fast as the game can draw.
+    """
+    game.start_session(recording.seed)
+    pygame.event.clear()
+    
+    for index, (frame_time, clicks, state, score) in enumerate(recording.frames):
+        game.clock.now = frame_time
+        for x, y, button in clicks:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=button))
+        game._run_frame()
+        
+        actual = (game.game_state.state, game.game_state.score)
+        if actual != (state, score):
+            return ReplayResult(index + 1, (index, (state, score), actual))
+    
+    return ReplayResult(len(recording.frames))
+
+def create_replay_game(drawing=False):
+    """Return a headless Game driven by a manual clock that saves nothing.
+    
+    Without drawing only input, rules and question generation run, which is
+    all that decides states and scores.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    
+    # Imported here because the game itself imports the recorder from this module
+    from game import Game
+    
+    game = Game(
+        clock=ManualClock(),
+        high_scores=HighScoreStore(path=None),
+        analytics=AnalyticsLogger(directory=None),
+        recorder=SessionRecorder(directory=None)
+    )
+    game.drawing = drawing
+    return game
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded sessions and check they end the same way.")
+    parser.add_argument('recordings', nargs='+', help="recording files to replay")
+    parser.add_argument('--draw', action='store_true', help="also draw every frame, to catch drawing errors")
+    args = parser.parse_args()
+    
+    game = create_replay_game(drawing=args.draw)
+    failures = 0
+    frames = 0
+    start = time.perf_counter()
+    
+    for path in args.recordings:
+        result = replay(game, read_recording(path))
+        frames += result.frames
+        if not result.ok:
+            failures += 1
+            index, expected, actual = result.mismatch
+            print(f"{path}: frame {index} expected {STATE_NAMES[expected[0]]} with score {expected[1]}, "
+                  f"got {STATE_NAMES[actual[0]]} with score {actual[1]}")
+    
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(args.recordings)} sessions ({frames} frames) in {elapsed:.2f} s, {failures} mismatched")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
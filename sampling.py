@@ -0,0 +1,181 @@
+"""
+Weighted sampling for AWS Cloud Heroes game.
+Contains a Fenwick tree sampler and the per-player accuracy weights that
+steer questions toward the services the player gets wrong.
+"""
+
+from config import *
+
+class WeightedSampler:
+    """Random choice over integer weights, backed by a Fenwick tree.
+    
+    Changing one weight and drawing an index both take O(log n), so large
+    banks never rebuild a cumulative weight list.
+    """
+    
+    def __init__(self, weights):
+        self.weights = list(weights)
+        self.size = len(self.weights)
+        self.total = 0
+        
+        # Build the 1-based tree in O(n) by pushing each node into its parent
+        self.tree = [0] + self.weights
+        for i in range(1, self.size + 1):
+            if self.weights[i - 1] < 0:
+                raise ValueError(f"Weight must not be negative: {self.weights[i - 1]}")
+            self.total += self.weights[i - 1]
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+        
+        # Largest power of two within the tree, where the search for a draw starts
+        self.top_step = 1 << (self.size.bit_length() - 1) if self.size else 0
+    
+    def __len__(self):
+        return self.size
+    
+    def update(self, index, weight):
+        """Set the weight of the item at index."""
+        if weight < 0:
+            raise ValueError(f"Weight must not be negative: {weight}")
+        delta = weight - self.weights[index]
+        if not delta:
+            return
+        
+        self.weights[index] = weight
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+    
+    def prefix_sum(self, count):
+        """Return the total weight of the first count items."""
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+        return total
+    
+    def sample(self, rng):
+        """Return an index drawn with probability proportional to its weight."""
+        if self.total <= 0:
+            raise ValueError("Cannot sample when every weight is zero")
+        
+        # Descend the tree to the item whose cumulative range contains the target
+        target = rng.randrange(self.total)
+        position = 0
+        step = self.top_step
+        while step:
+            node = position + step
+            if node <= self.size and self.tree[node] <= target:
+                position = node
+                target -= self.tree[node]
+            step >>= 1
+        return position
+
+class SparseWeightedSampler:
+    """A Fenwick tree sampler whose items all start with the same weight.
+    
+    With equal weights every tree node holds the weight times the number of
+    items it covers, so only the differences from that are stored. Creating
+    a sampler is O(1) and its memory grows with the items changed, not with
+    the number of items.
+    """
+    
+    def __init__(self, size, weight):
+        if weight < 0:
+            raise ValueError(f"Weight must not be negative: {weight}")
+        self.size = size
+        self.default = weight
+        self.total = weight * size
+        # Changed item weights, and the change each tree node has seen
+        self.weights = {}
+        self.deltas = {}
+        self.top_step = 1 << (size.bit_length() - 1) if size else 0
+    
+    def __len__(self):
+        return self.size
+    
+    def weight(self, index):
+        """Return the weight of the item at index."""
+        return self.weights.get(index, self.default)
+    
+    def update(self, index, weight):
+        """Set the weight of the item at index."""
+        if weight < 0:
+            raise ValueError(f"Weight must not be negative: {weight}")
+        delta = weight - self.weights.get(index, self.default)
+        if not delta:
+            return
+        
+        self.weights[index] = weight
+        self.total += delta
+        deltas = self.deltas
+        i = index + 1
+        while i <= self.size:
+            deltas[i] = deltas.get(i, 0) + delta
+            i += i & -i
+    
+    def _node(self, node):
+        """Return the total weight covered by a tree node."""
+        return self.default * (node & -node) + self.deltas.get(node, 0)
+    
+    def prefix_sum(self, count):
+        """Return the total weight of the first count items."""
+        total = 0
+        while count > 0:
+            total += self._node(count)
+            count -= count & -count
+        return total
+    
+    def sample(self, rng):
+        """Return an index drawn with probability proportional to its weight."""
+        if self.total <= 0:
+            raise ValueError("Cannot sample when every weight is zero")
+        
+        # Descend the tree to the item whose cumulative range contains the target
+        target = rng.randrange(self.total)
+        position = 0
+        step = self.top_step
+        while step:
+            node = position + step
+            if node <= self.size:
+                value = self._node(node)
+                if value <= target:
+                    position = node
+                    target -= value
+            step >>= 1
+        return position
+
+class AdaptiveSelector:
+    """Tracks how often a player misses each service and picks questions accordingly.
+    
+    A service's weight is its smoothed miss rate, (missed + 1) / (asked + 2),
+    scaled to an integer, so unseen services start in the middle, services
+    the player keeps missing come up more and mastered ones less, but never
+    disappear. Only the services the player has answered are stored, so a
+    selector costs the same to create for any bank size.
+    """
+    
+    def __init__(self, size, scale=ADAPTIVE_WEIGHT_SCALE):
+        self.scale = scale
+        self.asked = {}
+        self.missed = {}
+        self.sampler = SparseWeightedSampler(size, self.weight(0, 0))
+    
+    def weight(self, asked, missed):
+        """Return the sampling weight for a service with the given history."""
+        return max(1, self.scale * (missed + 1) // (asked + 2))
+    
+    def record(self, index, is_correct):
+        """Update the service's history after the player answered it."""
+        asked = self.asked[index] = self.asked.get(index, 0) + 1
+        missed = self.missed.get(index, 0)
+        if not is_correct:
+            missed = self.missed[index] = missed + 1
+        self.sampler.update(index, self.weight(asked, missed))
+    
+    def select(self, rng):
+        """Return the index of the service to ask about next."""
+        return self.sampler.sample(rng)
@@ -0,0 +1,69 @@
+"""
+Frame scheduling for AWS Cloud Heroes game.
+Contains the adaptive scheduler that idles on static screens instead of spinning at full FPS.
+"""
+
+import pygame
+from config import *
+
+# Event types the game handles
+HANDLED_EVENT_NAMES = (
+    'QUIT', 'MOUSEBUTTONDOWN', 'KEYDOWN', 'VIDEOEXPOSE', 'VIDEORESIZE',
+    'WINDOWFOCUSLOST', 'WINDOWFOCUSGAINED', 'WINDOWEXPOSED', 'WINDOWRESTORED'
+)
+
+# Frequent event types the game ignores, dropped before they reach the queue.
+# Blocking these by name is much faster at startup than blocking every type.
+IGNORED_EVENT_NAMES = (
+    'MOUSEMOTION', 'MOUSEBUTTONUP', 'MOUSEWHEEL', 'KEYUP', 'TEXTINPUT', 'TEXTEDITING',
+    'FINGERMOTION', 'FINGERDOWN', 'FINGERUP', 'MULTIGESTURE',
+    'JOYAXISMOTION', 'JOYBALLMOTION', 'JOYHATMOTION', 'JOYBUTTONDOWN', 'JOYBUTTONUP',
+    'CONTROLLERAXISMOTION', 'CONTROLLERBUTTONDOWN', 'CONTROLLERBUTTONUP',
+    'WINDOWMOVED', 'WINDOWENTER', 'WINDOWLEAVE', 'AUDIODEVICEADDED', 'AUDIODEVICEREMOVED',
+    'ACTIVEEVENT'
+)
+
+class FrameScheduler:
+    """Paces the main loop at a fixed rate when animating and blocks on input when idle."""
+    
+    def __init__(self, fps=FPS, unfocused_fps=UNFOCUSED_FPS):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.unfocused_fps = unfocused_fps
+        self.focused = True
+        self.idle_frames = 0
+    
+    @staticmethod
+    def restrict_events():
+        """Keep the event types the game ignores out of the event queue."""
+        # Older pygame versions lack some of these events
+        blocked = [getattr(pygame, name) for name in IGNORED_EVENT_NAMES if hasattr(pygame, name)]
+        allowed = [getattr(pygame, name) for name in HANDLED_EVENT_NAMES if hasattr(pygame, name)]
+        pygame.event.set_blocked(blocked)
+        pygame.event.set_allowed(allowed)
+    
+    def set_focused(self, focused):
+        """Record whether the window has input focus."""
+        self.focused = focused
+    
+    def wait(self, timeout=None):
+        """Wait until the next frame is due.
+        
+        With no timeout the loop runs at the frame rate, reduced while the window is
+        unfocused. With a timeout in milliseconds the call blocks until an event arrives
+        or the timeout expires, whichever comes first.
+        """
+        if timeout is None:
+            self.clock.tick(self.fps if self.focused else self.unfocused_fps)
+            return
+        
+        # A zero timeout would make pygame wait forever
+        event = pygame.event.wait(max(1, int(timeout)))
+        if event.type != pygame.NOEVENT:
+            # Put the event back so the next frame handles it as usual
+            pygame.event.post(event)
+        else:
+            self.idle_frames += 1
+        
+        # Keep the clock's frame timing in step without adding a delay
+        self.clock.tick()
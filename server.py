@@ -0,0 +1,198 @@
+"""
+Classroom server for AWS Cloud Heroes.
+Hosts many game sessions in one asyncio process; thin clients send clicks over TCP.
+
+Each connection is one session. Messages are JSON objects, one per line:
+    {"op": "start"}                 start a new game
+    {"op": "answer", "index": 2}    choose an answer option
+    {"op": "menu"}                  go back to the menu
+    {"op": "state"}                 ask for the current state
+The server replies to every message, and pushes an update whenever a timer
+changes the state, with the session's state as a JSON object.
+
+Run with:
+    python server.py [--host HOST] [--port PORT]
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import random
+from config import *
+from engine import GameEngine
+from questions import QuestionBank
+
+class TimerScheduler:
+    """Runs every session's timers from one task using a heap of deadlines."""
+    
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []
+        self.counter = itertools.count()
+        self.wake = asyncio.Event()
+    
+    def schedule(self, deadline, session, generation):
+        """Call session.on_timer(generation) once the clock reaches deadline."""
+        order = next(self.counter)
+        heapq.heappush(self.heap, (deadline, order, session, generation))
+        if self.heap[0][1] == order:
+            # The new deadline is the earliest one, so the run loop must re-check
+            self.wake.set()
+    
+    async def run(self):
+        """Fire due timers forever."""
+        while True:
+            now = self.clock()
+            while self.heap and self.heap[0][0] <= now:
+                _, _, session, generation = heapq.heappop(self.heap)
+                session.on_timer(generation)
+            
+            self.wake.clear()
+            timeout = (self.heap[0][0] - now) / 1000 if self.heap else None
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+class Session:
+    """One player's game, driven by messages from a client connection."""
+    
+    __slots__ = ('server', 'writer', 'engine', 'timer_generation', 'closed')
+    
+    def __init__(self, server, writer):
+        self.server = server
+        self.writer = writer
+        self.engine = GameEngine(clock=server.clock, rng=random.Random(), bank=server.bank)
+        # Timers scheduled before the latest state change are ignored when they fire
+        self.timer_generation = 0
+        self.closed = False
+    
+    def handle(self, message):
+        """Apply a client message and send back the resulting state."""
+        op = message.get('op')
+        self.engine.update()
+        
+        if op == 'start':
+            self.engine.start_game()
+        elif op == 'answer':
+            index = message.get('index')
+            if self.engine.state.state == PLAYING and isinstance(index, int) and 0 <= index < len(self.engine.state.options):
+                self.engine.answer(index)
+        elif op == 'menu':
+            self.engine.return_to_menu()
+        elif op != 'state':
+            self.send({'error': f"Unknown op: {op!r}"})
+            return
+        
+        self._reschedule()
+        self.send(self.snapshot())
+    
+    def on_timer(self, generation):
+        """Apply an expired timer and push the new state to the client."""
+        if self.closed or generation != self.timer_generation:
+            return
+        self.engine.update()
+        self._reschedule()
+        self.send(self.snapshot())
+    
+    def snapshot(self):
+        """Return the state the client needs to draw its screen."""
+        state = self.engine.state
+        snapshot = {'state': STATE_NAMES[state.state], 'score': state.score}
+        if state.state in (PLAYING, FEEDBACK):
+            snapshot['service'] = state.current_service.name
+            snapshot['options'] = self.engine.option_descriptions()
+            snapshot['time_remaining'] = self.engine.time_remaining()
+        if state.state == FEEDBACK:
+            snapshot['feedback'] = state.feedback_message
+            snapshot['selected_option'] = state.selected_option
+            snapshot['correct_option'] = state.correct_option
+        return snapshot
+    
+    def send(self, message):
+        """Queue a message for the client."""
+        if not self.closed:
+            self.writer.write(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+    
+    def close(self):
+        """Stop reacting to timers."""
+        self.closed = True
+    
+    def _reschedule(self):
+        """Schedule the next timer for the current state."""
+        self.timer_generation += 1
+        deadline = self.engine.next_transition_time()
+        if deadline is not None:
+            self.server.scheduler.schedule(deadline, self, self.timer_generation)
+
+class ClassroomServer:
+    """Accepts client connections and gives each one its own session."""
+    
+    def __init__(self, bank=None):
+        self.bank = bank if bank is not None else QuestionBank.default()
+        self.loop = None
+        self.scheduler = None
+        self.scheduler_task = None
+        self.sessions = set()
+    
+    def clock(self):
+        """Return the event loop time in milliseconds."""
+        return int(self.loop.time() * 1000)
+    
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        """Start listening and return the asyncio server."""
+        self.loop = asyncio.get_running_loop()
+        self.scheduler = TimerScheduler(self.clock)
+        self.scheduler_task = asyncio.ensure_future(self.scheduler.run())
+        return await asyncio.start_server(self._serve_client, host, port, limit=SERVER_MAX_MESSAGE_BYTES)
+    
+    async def _serve_client(self, reader, writer):
+        """Run one session until the client disconnects."""
+        session = Session(self, writer)
+        self.sessions.add(session)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    session.send({'error': "Invalid JSON"})
+                    continue
+                if not isinstance(message, dict):
+                    session.send({'error': "Expected a JSON object"})
+                    continue
+                session.handle(message)
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # ValueError is raised for lines longer than the reader limit
+            pass
+        finally:
+            session.close()
+            self.sessions.discard(session)
+            writer.close()
+
+async def serve(host, port):
+    """Run the server until interrupted."""
+    server = ClassroomServer()
+    listener = await server.start(host, port)
+    print(f"AWS Cloud Heroes classroom server listening on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="AWS Cloud Heroes classroom server")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
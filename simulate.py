@@ -0,0 +1,227 @@
+"""
+Monte Carlo game balancing for AWS Cloud Heroes.
+Plays many games with simulated players through the display-independent
+engine, spread over worker processes, and reports the score distribution.
+
+Each worker plays a shard of games and returns a score histogram; the
+histograms are merged as shards finish, and can be written to files and
+merged again later.
+
+Run from the repository root:
+    python simulate.py [--games N] [--workers N] [--accuracy P] [--reaction MS] [--output DIR]
+    python simulate.py --merge DIR/*.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import *
+from engine import GameEngine, ManualClock
+from questions import QuestionBank
+
+class ScoreHistogram:
+    """Counts of final scores, mergeable across shards."""
+    
+    def __init__(self, counts=None):
+        self.counts = dict(counts) if counts else {}
+    
+    def add(self, score):
+        """Count one game with the given score."""
+        self.counts[score] = self.counts.get(score, 0) + 1
+    
+    def merge(self, other):
+        """Add the counts of another histogram to this one and return it."""
+        for score, count in other.counts.items():
+            self.counts[score] = self.counts.get(score, 0) + count
+        return self
+    
+    @property
+    def games(self):
+        return sum(self.counts.values())
+    
+    def mean(self):
+        games = self.games
+        return sum(score * count for score, count in self.counts.items()) / games if games else 0
+    
+    def percentile(self, fraction):
+        """Return the nearest-rank percentile score."""
+        rank = max(1, int(round(fraction * self.games)))
+        seen = 0
+        for score in sorted(self.counts):
+            seen += self.counts[score]
+            if seen >= rank:
+                return score
+        return 0
+    
+    def to_dict(self):
+        return {'counts': {str(score): count for score, count in sorted(self.counts.items())}}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls({int(score): count for score, count in data['counts'].items()})
+
+class SimulatedPlayer:
+    """A player whose skill is drawn for each game.
+    
+    Accuracy comes from a beta distribution around the mean accuracy, and each
+    reaction time from a log-normal distribution around the median reaction.
+    """
+    
+    def __init__(self, accuracy=0.75, accuracy_spread=0.15, reaction_ms=3000, reaction_spread=0.5):
+        self.accuracy = accuracy
+        self.accuracy_spread = accuracy_spread
+        self.reaction_ms = reaction_ms
+        self.reaction_spread = reaction_spread
+    
+    def draw_accuracy(self, rng):
+        """Return the chance of a correct answer for one game."""
+        if self.accuracy_spread <= 0 or self.accuracy <= 0 or self.accuracy >= 1:
+            return self.accuracy
+        # Beta distribution with the given mean and standard deviation
+        variance = min(self.accuracy_spread ** 2, self.accuracy * (1 - self.accuracy) * 0.99)
+        if variance <= 0:
+            return self.accuracy
+        concentration = self.accuracy * (1 - self.accuracy) / variance - 1
+        return rng.betavariate(self.accuracy * concentration, (1 - self.accuracy) * concentration)
+    
+    def draw_reaction(self, rng):
+        """Return the milliseconds taken to answer one question."""
+        return max(1, int(self.reaction_ms * rng.lognormvariate(0, self.reaction_spread)))
+
+def play_game(engine, clock, player, rng):
+    """Play one game to the end and return the final score."""
+    accuracy = player.draw_accuracy(rng)
+    engine.start_game()
+    
+    while True:
+        # Time runs out before the player answers
+        answer_time = clock.now + player.draw_reaction(rng)
+        game_end = engine.next_transition_time()
+        if answer_time >= game_end:
+            clock.now = game_end
+            engine.update()
+            return engine.state.score
+        
+        clock.now = answer_time
+        state = engine.state
+        wrong_options = [i for i in range(len(state.options)) if i != state.correct_option]
+        # With a single option there is nothing wrong to pick
+        if wrong_options and rng.random() >= accuracy:
+            engine.answer(rng.choice(wrong_options))
+        else:
+            engine.answer(state.correct_option)
+        
+        # Wait out the feedback pause
+        clock.now = engine.next_transition_time()
+        engine.update()
+
+# Loaded once per worker process
+_bank = None
+
+def _init_worker():
+    """Load the question bank in a worker process."""
+    global _bank
+    _bank = QuestionBank.default()
+
+def simulate_shard(seed, games, player, rules):
+    """Play a shard of games and return their score histogram as a dict."""
+    if _bank is None:
+        _init_worker()
+    
+    rng = random.Random(seed)
+    clock = ManualClock()
+    histogram = ScoreHistogram()
+    for _ in range(games):
+        # A fresh engine per game, so each simulated player starts without history
+        engine = GameEngine(clock=clock, rng=rng, bank=_bank, **rules)
+        histogram.add(play_game(engine, clock, player, rng))
+    return histogram.to_dict()
+
+def run(games, shard_size, workers, player, rules, seed=0, output=None, progress=None):
+    """Simulate games across worker processes and return the merged histogram.
+    
+    Shards are merged in whatever order they finish; with output set each
+    shard's histogram is also written there as it arrives.
+    """
+    total = ScoreHistogram()
+    shards = [(index, min(shard_size, games - start)) for index, start in enumerate(range(0, games, shard_size))]
+    if output:
+        os.makedirs(output, exist_ok=True)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(simulate_shard, seed * 1000003 + index, count, player, rules): index
+            for index, count in shards
+        }
+        for future in as_completed(futures):
+            data = future.result()
+            total.merge(ScoreHistogram.from_dict(data))
+            if output:
+                with open(os.path.join(output, f"shard-{futures[future]:05d}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+            if progress:
+                progress(total)
+    
+    return total
+
+def report(histogram, elapsed=None):
+    """Return a text summary of a score histogram."""
+    lines = [f"{histogram.games} games, mean score {histogram.mean():.1f}"]
+    if elapsed:
+        lines[0] += f", {histogram.games / elapsed:,.0f} games/s"
+    lines.append("  " + "  ".join(f"p{int(fraction * 100)} {histogram.percentile(fraction)}"
+                                 for fraction in (0.01, 0.1, 0.5, 0.9, 0.99)))
+    
+    # Bar chart of the distribution
+    peak = max(histogram.counts.values(), default=0)
+    for score in sorted(histogram.counts):
+        count = histogram.counts[score]
+        lines.append(f"  {score:>5} {count / histogram.games:7.2%} {'#' * max(1, round(40 * count / peak))}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many games to see how settings change the scores.")
+    parser.add_argument('--games', type=int, default=1000000, help="games to simulate")
+    parser.add_argument('--shard-size', type=int, default=10000, help="games per worker task")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--accuracy', type=float, default=0.75, help="mean chance of a correct answer")
+    parser.add_argument('--accuracy-spread', type=float, default=0.15, help="standard deviation of accuracy between games")
+    parser.add_argument('--reaction', type=float, default=3000, help="median milliseconds to answer")
+    parser.add_argument('--reaction-spread', type=float, default=0.5, help="log-normal sigma of reaction times")
+    parser.add_argument('--duration', type=int, default=GAME_DURATION, help="game length in seconds")
+    parser.add_argument('--feedback', type=int, default=FEEDBACK_DURATION, help="feedback pause in milliseconds")
+    parser.add_argument('--points', type=int, default=CORRECT_ANSWER_POINTS, help="points per correct answer")
+    parser.add_argument('--output', help="directory to write each shard's histogram to")
+    parser.add_argument('--merge', nargs='+', metavar='FILE', help="merge and report shard files instead of simulating")
+    args = parser.parse_args()
+    
+    if args.merge:
+        total = ScoreHistogram()
+        for path in args.merge:
+            with open(path, encoding='utf-8') as f:
+                total.merge(ScoreHistogram.from_dict(json.load(f)))
+        print(report(total))
+        return
+    
+    player = SimulatedPlayer(args.accuracy, args.accuracy_spread, args.reaction, args.reaction_spread)
+    rules = {
+        'game_duration': args.duration,
+        'feedback_duration': args.feedback,
+        'correct_answer_points': args.points
+    }
+    
+    def progress(histogram):
+        print(f"\r{histogram.games}/{args.games} games, mean {histogram.mean():.1f}", end='', file=sys.stderr, flush=True)
+    
+    start = time.perf_counter()
+    total = run(args.games, args.shard_size, args.workers, player, rules, args.seed, args.output, progress)
+    print(file=sys.stderr)
+    print(report(total, time.perf_counter() - start))
+
+if __name__ == "__main__":
+    main()
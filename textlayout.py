@@ -0,0 +1,218 @@
+"""
+Text layout for AWS Cloud Heroes game.
+Contains word wrapping and shrink-to-fit layout of text inside a box, with
+word and line widths measured once per font and remembered, so laying out
+the same vocabulary again only adds up cached numbers, and finished layouts
+remembered per text and box, so laying out the same text again is free.
+"""
+
+from config import *
+from fonts import font_registry, get_font
+
+# Appended to the last line when text does not fit even at the smallest size
+ELLIPSIS = "..."
+
+class WordWidths:
+    """Remembers the rendered width of each word and line per font, and finished layouts."""
+    
+    def __init__(self):
+        self.fonts = {}
+        self.layouts = {}
+        self.misses = 0
+    
+    def widths_for(self, font):
+        """Return the word-to-width dict of a font, which layout reads directly in its inner loop."""
+        widths = self.fonts.get(font)
+        if widths is None:
+            widths = self.fonts[font] = {}
+        return widths
+    
+    def width(self, font, word):
+        """Return the width of word in pixels, measuring it only the first time."""
+        widths = self.widths_for(font)
+        width = widths.get(word)
+        if width is None:
+            self.misses += 1
+            width = widths[word] = font.size(word)[0]
+        return width
+    
+    def layout(self, key):
+        """Return the layout remembered under key, or None."""
+        return self.layouts.get(key)
+    
+    def remember_layout(self, key, layout):
+        """Remember a finished layout under key."""
+        self.layouts[key] = layout
+    
+    def invalidate(self, font=None):
+        """Forget the widths and layouts of the given font, or of every font if no font is given."""
+        if font is None:
+            self.fonts.clear()
+            self.layouts.clear()
+        else:
+            self.fonts.pop(font, None)
+            self.layouts = {key: layout for key, layout in self.layouts.items() if layout.font is not font}
+    
+    def stats(self):
+        """Return the number of remembered widths and layouts and how many strings were measured."""
+        return {
+            'fonts': len(self.fonts),
+            'widths': sum(len(widths) for widths in self.fonts.values()),
+            'layouts': len(self.layouts),
+            'misses': self.misses
+        }
+
+# Shared measurements used by all text layout
+word_widths = WordWidths()
+
+# Widths measured with a font are meaningless once the registry drops that font
+font_registry.add_eviction_listener(word_widths.invalidate)
+
+class TextLayout:
+    """Lines of text laid out with one font."""
+    
+    def __init__(self, font, size, lines, line_height, truncated=False):
+        self.font = font
+        self.size = size
+        self.lines = lines
+        self.line_height = line_height
+        self.truncated = truncated
+    
+    @property
+    def height(self):
+        return len(self.lines) * self.line_height
+
+def wrap_text(text, font, width, widths=word_widths):
+    """Break text into lines no wider than width, splitting only words that are too long on their own.
+    
+    Line widths are the sum of word and space widths, which can be off from
+    the rendered line by about a pixel per word because of kerning, so lines
+    that come within that margin of width are measured as a whole, and that
+    width is remembered like a word's.
+    """
+    return _wrap_words(text.split(), font, width, widths)
+
+def _wrap_words(words, font, width, widths):
+    """Greedily fill lines with words, looking up each width in the font's memo."""
+    measured = widths.widths_for(font)
+    space = widths.width(font, " ")
+    lines = []
+    line_start = 0
+    line_width = -space
+    
+    for i, word in enumerate(words):
+        word_width = measured.get(word)
+        if word_width is None:
+            word_width = widths.width(font, word)
+        
+        candidate = line_width + space + word_width
+        if candidate <= width and (
+            candidate + i - line_start <= width
+            or widths.width(font, " ".join(words[line_start:i + 1])) <= width
+        ):
+            line_width = candidate
+            continue
+        
+        if i > line_start:
+            lines.append(" ".join(words[line_start:i]))
+        line_start = i
+        line_width = word_width
+        
+        if word_width > width:
+            # Break the word between characters; all but the last piece fill whole lines
+            pieces = _split_word(word, font, width)
+            lines.extend(pieces[:-1])
+            words[i] = pieces[-1]
+            line_width = widths.width(font, pieces[-1])
+    
+    if line_start < len(words):
+        lines.append(" ".join(words[line_start:]))
+    return lines
+
+def _split_word(word, font, width):
+    """Split a word into pieces that each fit in width, keeping at least one character per piece.
+    
+    Each piece is the longest prefix of the rest whose rendered width fits,
+    found by bisection, since summed character widths round each advance down.
+    """
+    pieces = []
+    while word:
+        low, high = 1, len(word)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if font.size(word[:middle])[0] <= width:
+                low = middle
+            else:
+                high = middle - 1
+        pieces.append(word[:low])
+        word = word[low:]
+    return pieces
+
+def fit_text(text, width, height, max_size=GAME_FONT_SIZE, min_size=TEXT_MIN_FONT_SIZE, face=FONT_NAME, widths=word_widths):
+    """Lay out text in the largest font size from max_size down to min_size that fits the box.
+    
+    Sizes are searched by bisection, as smaller text never needs more lines
+    in practice. Text that does not fit even at min_size keeps the lines
+    that do and ends the last of them with an ellipsis. The result is
+    remembered, so the same text in the same box is laid out only once.
+    """
+    key = (text, width, height, max_size, min_size, face)
+    layout = widths.layout(key)
+    if layout is None:
+        layout = _fit_words(text.split(), width, height, max_size, min_size, face, widths)
+        widths.remember_layout(key, layout)
+    return layout
+
+def _fit_words(words, width, height, max_size, min_size, face, widths):
+    """Search font sizes for the largest one whose wrapped lines fit the box."""
+    best = None
+    low, high = min_size, max_size
+    
+    # Most text fits at full size, so try that before bisecting
+    size = max_size
+    while low <= high:
+        font = get_font(size, face)
+        lines = _wrap_words(list(words), font, width, widths)
+        line_height = font.get_linesize()
+        if len(lines) * line_height <= height and _lines_fit(lines, font, width, widths):
+            best = TextLayout(font, size, lines, line_height)
+            low = size + 1
+        else:
+            high = size - 1
+        size = (low + high) // 2
+    
+    if best is not None:
+        return best
+    
+    # Nothing fits, so cut the text short at the smallest size
+    font = get_font(min_size, face)
+    line_height = font.get_linesize()
+    lines = _wrap_words(words, font, width, widths)[:max(1, height // line_height)]
+    lines[-1] = _ellipsize(lines[-1], font, width)
+    return TextLayout(font, min_size, lines, line_height, truncated=True)
+
+def _lines_fit(lines, font, width, widths):
+    """Return whether every line renders no wider than width."""
+    return all(widths.width(font, line) <= width for line in lines)
+
+def _ellipsize(line, font, width):
+    """Shorten a line until it fits in width with the ellipsis appended."""
+    words = line.split()
+    # Measured directly, as these shortened lines are not worth remembering
+    while words and font.size(" ".join(words) + ELLIPSIS)[0] > width:
+        if len(words) > 1:
+            words.pop()
+        elif len(words[0]) > 1:
+            words[0] = words[0][:-1]
+        else:
+            words.pop()
+    return " ".join(words) + ELLIPSIS
+
+def fit_option_text(text, widths=word_widths):
+    """Lay out an answer option inside its box."""
+    return fit_text(
+        text,
+        OPTION_BOX_WIDTH - 2 * OPTION_TEXT_PADDING,
+        OPTION_BOX_HEIGHT - 2 * OPTION_TEXT_PADDING,
+        widths=widths
+    )
@@ -5,7 +5,9 @@ Contains classes and functions for rendering UI elements.
 
 import pygame
 import math
+from collections import OrderedDict
 from config import *
+from fonts import get_font, font_registry
 
 class Button:
     """A clickable button with text."""
@@ -18,30 +20,50 @@ class Button:
         self.color = color
         self.text = text
         self.text_color = text_color
-        self.font = font
+        # Use the shared button font unless a specific one is given
+        self.font = font if font is not None else get_font(BUTTON_FONT_SIZE)
         self.border_color = border_color
         self.border_width = border_width
         self.pulsing = False
         self.pulse_speed = 200  # milliseconds per pulse cycle
         self.pulse_amount = 0.05  # how much to scale during pulse
+        self.face = None  # pre-rendered look of the button when it is not pulsing
     
-    def draw(self, surface):
-        """Draw the button on the given surface."""
+    @property
+    def bounds(self):
+        """The largest area the button can cover while pulsing."""
+        rect = pygame.Rect(self.x - self.width/2, self.y - self.height/2, self.width, self.height)
+        if self.pulsing:
+            rect = rect.inflate(math.ceil(self.width * self.pulse_amount) + 2, math.ceil(self.height * self.pulse_amount) + 2)
+        return rect
+    
+    def rect_at(self, time=None):
+        """Return the area the button covers at the given time in milliseconds.
+        
+        The pulse depends only on the time passed in, so drawing and
+        hit-testing with the same frame time see the same button.
+        """
         width = self.width
         height = self.height
         
         # Apply pulsing effect if enabled
         if self.pulsing:
-            pulse_factor = 1.0 + self.pulse_amount * math.sin(pygame.time.get_ticks() / self.pulse_speed)
+            if time is None:
+                time = pygame.time.get_ticks()
+            pulse_factor = 1.0 + self.pulse_amount * math.sin(time / self.pulse_speed)
             width *= pulse_factor
             height *= pulse_factor
         
         # Calculate centered position
-        x = self.x - width/2
-        y = self.y - height/2
+        return pygame.Rect(self.x - width/2, self.y - height/2, width, height)
+    
+    def draw(self, surface, time=None):
+        """Draw the button on the given surface as it looks at the given time and return the area it covers."""
+        if self.face is not None and not self.pulsing:
+            return surface.blit(self.face, (self.x - self.width/2, self.y - self.height/2))
         
         # Draw button background
-        button_rect = pygame.Rect(x, y, width, height)
+        button_rect = self.rect_at(time)
         pygame.draw.rect(surface, self.color, button_rect, 0, BUTTON_PADDING)
         
         # Draw border if specified
@@ -50,26 +72,107 @@ class Button:
         
         # Draw text
         if self.font:
-            text_surf = self.font.render(self.text, True, self.text_color)
+            text_surf = text_cache.render(self.text, self.font, self.text_color)
             text_rect = text_surf.get_rect(center=(self.x, self.y))
             surface.blit(text_surf, text_rect)
+        
+        return button_rect
     
-    def is_clicked(self, pos):
-        """Check if the button was clicked."""
-        width = self.width
-        height = self.height
+    def render_face(self):
+        """Render the button at rest into a surface of its own size."""
+        face = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        x, y, pulsing, self.face = self.x, self.y, self.pulsing, None
+        self.x, self.y, self.pulsing = self.width/2, self.height/2, False
+        try:
+            self.draw(face)
+        finally:
+            self.x, self.y, self.pulsing = x, y, pulsing
+        return face
+    
+    def is_clicked(self, pos, time=None):
+        """Check if the button was clicked, as it looks at the given time."""
+        return self.rect_at(time).collidepoint(pos)
+
+class TextSurfaceCache:
+    """Least-recently-used cache of rendered text surfaces with a memory cap."""
+    
+    def __init__(self, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Surfaces loaded from the baked atlas; they live in shared memory and are never evicted
+        self.baked = {}
+    
+    def preload(self, text, font, color, surf, antialias=True):
+        """Add an already rendered surface, such as one from the baked atlas."""
+        self.baked[(text, font, tuple(color), antialias)] = surf
+    
+    def render(self, text, font, color, antialias=True):
+        """Return the rendered surface for the text, rasterizing it only on a miss."""
+        key = (text, font, tuple(color), antialias)
+        surf = self.baked.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
         
-        # Apply pulsing effect if enabled
-        if self.pulsing:
-            pulse_factor = 1.0 + self.pulse_amount * math.sin(pygame.time.get_ticks() / self.pulse_speed)
-            width *= pulse_factor
-            height *= pulse_factor
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
         
-        # Calculate centered position
-        x = self.x - width/2
-        y = self.y - height/2
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        self.size_bytes += self._surface_bytes(surf)
         
-        return x <= pos[0] <= x + width and y <= pos[1] <= y + height
+        # Evict the least recently used surfaces once over the memory cap
+        while self.size_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.size_bytes -= self._surface_bytes(evicted)
+            self.evictions += 1
+        
+        return surf
+    
+    def invalidate(self, font=None):
+        """Drop cached surfaces for the given font, or every surface if no font is given."""
+        if font is None:
+            self.surfaces.clear()
+            self.baked.clear()
+            self.size_bytes = 0
+            return
+        
+        for key in [key for key in self.surfaces if key[1] is font]:
+            self.size_bytes -= self._surface_bytes(self.surfaces.pop(key))
+        for key in [key for key in self.baked if key[1] is font]:
+            del self.baked[key]
+    
+    def stats(self):
+        """Return hit rate, counters and memory usage."""
+        lookups = self.hits + self.misses
+        return {
+            'surfaces': len(self.surfaces),
+            'baked': len(self.baked),
+            'bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    @staticmethod
+    def _surface_bytes(surf):
+        """Return the pixel memory used by a surface."""
+        return surf.get_pitch() * surf.get_height()
+
+# Shared cache used by all text rendering
+text_cache = TextSurfaceCache()
+
+# Surfaces rendered with a font are stale once the registry drops that font
+font_registry.add_eviction_listener(text_cache.invalidate)
 
 class TextRenderer:
     """Helper class for rendering text with effects."""
@@ -79,7 +182,7 @@ class TextRenderer:
         """Render text with optional shadow effect."""
         # Render shadow if requested
         if shadow:
-            shadow_surf = font.render(text, True, shadow_color)
+            shadow_surf = text_cache.render(text, font, shadow_color)
             shadow_pos = position[0] + shadow_offset[0], position[1] + shadow_offset[1]
             
             if center:
@@ -90,7 +193,7 @@ class TextRenderer:
             surface.blit(shadow_surf, shadow_rect)
         
         # Render main text
-        text_surf = font.render(text, True, color)
+        text_surf = text_cache.render(text, font, color)
         
         if center:
             text_rect = text_surf.get_rect(center=position)
@@ -100,3 +203,16 @@ class TextRenderer:
         surface.blit(text_surf, text_rect)
         
         return text_rect
+    
+    @staticmethod
+    def render_layout(surface, layout, color, position):
+        """Render laid-out lines one below another, centered as a block on position."""
+        x, y = position
+        top = y - layout.height / 2
+        block_rect = None
+        
+        for i, line in enumerate(layout.lines):
+            line_rect = TextRenderer.render_text(surface, line, layout.font, color, (x, top + (i + 0.5) * layout.line_height))
+            block_rect = line_rect if block_rect is None else block_rect.union(line_rect)
+        
+        return block_rect
@@ -0,0 +1,87 @@
+"""
+Widget layout for AWS Cloud Heroes game.
+Contains retained hit areas for each screen, laid out only when their inputs
+change and shared by drawing and hit-testing, with a uniform grid for pointer lookup.
+"""
+
+import pygame
+from config import *
+
+# Marks a widget layer that has never been laid out
+_NOT_LAID_OUT = object()
+
+class SpatialGrid:
+    """Uniform grid of square cells, each listing the items whose rects overlap it."""
+    
+    def __init__(self, cell_size=HIT_GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+    
+    def clear(self):
+        self.cells.clear()
+    
+    def insert(self, rect, item):
+        """Add an item to every cell its rect overlaps."""
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(item)
+    
+    def query(self, pos):
+        """Return the items whose rects overlap the cell containing pos, in insertion order."""
+        return self.cells.get((int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size), ())
+
+class WidgetLayer:
+    """Named hit areas for one screen, laid out again only when the key changes.
+    
+    The layout function receives the layer and calls add() for each widget.
+    Widgets added later are on top when areas overlap.
+    """
+    
+    def __init__(self, layout, key=None, cell_size=HIT_GRID_CELL_SIZE):
+        self.layout = layout
+        self.key = key
+        self.rects = {}
+        self.hit_tests = {}
+        self.grid = SpatialGrid(cell_size)
+        self.laid_out_key = _NOT_LAID_OUT
+        self.layouts = 0
+    
+    def invalidate(self):
+        """Force the layout to run again on next use."""
+        self.laid_out_key = _NOT_LAID_OUT
+    
+    def refresh(self):
+        """Run the layout if its inputs changed and return the layer."""
+        key = self.key() if self.key is not None else None
+        if key != self.laid_out_key:
+            self.rects.clear()
+            self.hit_tests.clear()
+            self.grid.clear()
+            self.layout(self)
+            self.laid_out_key = key
+            self.layouts += 1
+        return self
+    
+    def add(self, name, rect, hit_test=None):
+        """Add a widget covering rect; hit_test(pos) can narrow the area that counts as a hit."""
+        rect = pygame.Rect(rect)
+        self.rects[name] = rect
+        if hit_test is not None:
+            self.hit_tests[name] = hit_test
+        self.grid.insert(rect, name)
+        return rect
+    
+    def rect(self, name):
+        """Return the laid-out rect of a widget."""
+        return self.refresh().rects[name]
+    
+    def hit(self, pos):
+        """Return the name of the topmost widget at pos, or None."""
+        self.refresh()
+        for name in reversed(self.grid.query(pos)):
+            if self.rects[name].collidepoint(pos):
+                hit_test = self.hit_tests.get(name)
+                if hit_test is None or hit_test(pos):
+                    return name
+        return None